@@ -1,7 +1,8 @@
+from functools import lru_cache
 import periodictable as pt
-import numpy as np
 
 
+@lru_cache(maxsize=512)
 def format_element(
     symbol: str, mass: int, atomic_number: int = None, charge: int = None
 ) -> str:
@@ -12,20 +13,29 @@ def format_element(
     )
 
 
+@lru_cache(maxsize=256)
+def get_element(el_name: str = None, atomic_number: int = None):
+    if atomic_number is not None:
+        return pt.elements[int(atomic_number)]
+    return pt.elements.symbol(el_name)
+
+
+@lru_cache(maxsize=256)
+def most_abundant_isotope(symbol: str) -> int:
+    el = get_element(symbol)
+    return max(el.isotopes, key=lambda iso: el[iso].abundance)
+
+
+@lru_cache(maxsize=512)
 def element_string(
     el_name: str,
     atomic_number: int = None,
     iso: int = None,
     show_atomic_number: bool = True,
 ) -> str:
-    import periodictable as pt
-
-    if atomic_number is not None:
-        el = pt.elements[int(atomic_number)]
-    else:
-        el = pt.elements.symbol(el_name)
+    el = get_element(el_name, atomic_number)
     if iso is None:
-        iso = el.isotopes[np.argmax([el[iso].abundance for iso in el.isotopes])]
+        iso = most_abundant_isotope(el.symbol)
     if show_atomic_number:
         return format_element(el.symbol, iso, atomic_number=el.number)
     else:
@@ -43,7 +53,6 @@ def element(
 def isotope(el_name: str, iso: int) -> panflute.Math:
     return element(el_name, iso = iso)
 
-from io import StringIO
 import re
 
 # ([A-Z][a-z]?)([0-9]+)?(\^[0-9]*[\+|\-])?
@@ -54,31 +63,31 @@ el_regex = re.compile(
 
 
 def molecule(mol_string: str) -> str:
-    out = StringIO()
+    out = ["$"]
     for el_match in el_regex.finditer(mol_string):
         el = el_match.group("el")
         num = el_match.group("num")
         charge = el_match.group("charge")
-        out.write(f"\\text{{{el}}}")
+        out.append(f"\\text{{{el}}}")
         if num is not None:
-            out.write(f"_{{\\text{{{num}}}}}")
+            out.append(f"_{{\\text{{{num}}}}}")
         if charge is not None:
             charge = charge.lstrip("^")
             if charge[-1] not in ["+", "-"]:
                 charge = charge + "+"
-            out.write(f"^{{\\text{{{charge[:-1]}}}{charge[-1]}}}")
-    return "$" + out.getvalue() + "$"
+            out.append(f"^{{\\text{{{charge[:-1]}}}{charge[-1]}}}")
+    out.append("$")
+    return "".join(out)
 
 
-import re
+nuclear_regex = re.compile(
+    r"(?P<A>\d+)?(\_(?P<Z>\d+))?(?P<el>[A-Znp][a-z]?)?(?P<extras>\\[^\s]+(\{.*?\})?)?"
+)
 
 
 def nuclear_reaction_string(input: str) -> str:
     replacements = []
-    for match in re.finditer(
-        r"(?P<A>\d+)?(\_(?P<Z>\d+))?(?P<el>[A-Znp][a-z]?)?(?P<extras>\\[^\s]+(\{.*?\})?)?",
-        input,
-    ):
+    for match in nuclear_regex.finditer(input):
         if len(match.group()) == 0:
             continue
         A = match.group("A")
@@ -109,9 +118,14 @@ def nuclear_reaction_string(input: str) -> str:
                 out += extras
         replacements.append((match.start(), match.end(), out))
 
-    out = input
-    for start, end, replacement in replacements[::-1]:
-        out = out[:start] + replacement + out[end:]
+    parts = []
+    cursor = 0
+    for start, end, replacement in replacements:
+        parts.append(input[cursor:start])
+        parts.append(replacement)
+        cursor = end
+    parts.append(input[cursor:])
+    out = "".join(parts)
     out = out.replace("->", "\ \\longrightarrow\ ")
     return out
 
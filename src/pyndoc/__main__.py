@@ -1,14 +1,17 @@
 import sys
 from pathlib import Path
 import time
+from types import MappingProxyType
 from .preprocess import preprocess
 import subprocess
 import json
 import yaml
-from .server_utils import get_or_start_server, stop_server
+from .server_utils import get_or_start_server, stop_server, METADATA_FILE
 
 import logging
 
+FILTER_FILE = Path(__file__).parent / "filter.py"
+
 def start_logging(logging_level: str | None = None):
     """Start logging to a file."""
     if logging_level is not None:
@@ -56,32 +59,26 @@ def get_arg(
     """    
     if isinstance(arg, str):
         arg = [arg]
-    if is_flag:
-        for a in arg:
-            if a in args:
+    aliases = set(arg)
+    for i, sys_a in enumerate(args):
+        if sys_a in aliases:
+            if is_flag:
                 if remove:
-                    idx = args.index(a)
-                    args.pop(idx)
+                    args.pop(i)
                 return True
-        return False
-    for a in arg:
-        if a in args:
-            idx = args.index(a)
-            value = args[idx + 1]
+            value = args[i + 1]
             if remove:
-                args.pop(idx)
-                args.pop(idx)
+                args.pop(i)
+                args.pop(i)
             return value
-    for a in arg:
-        for i, sys_a in enumerate(args):
-            if "=" not in sys_a:
-                continue
-            sys_a = sys_a.split("=")
-            if sys_a[0] == a:
-                if remove:
-                    args.pop(i)
-                return sys_a[1]
-    return None
+        if is_flag or "=" not in sys_a:
+            continue
+        key, value = sys_a.split("=", 1)
+        if key in aliases:
+            if remove:
+                args.pop(i)
+            return value
+    return False if is_flag else None
 
 
 def replace_arg(args: list[str], arg: str | list[str], value: str):
@@ -104,23 +101,21 @@ def replace_arg(args: list[str], arg: str | list[str], value: str):
     """    
     if isinstance(arg, str):
         arg = [arg]
-    for a in arg:
-        if a in args:
-            idx = args.index(a)
-            args[idx + 1] = value
+    aliases = set(arg)
+    for i, sys_a in enumerate(args):
+        if sys_a in aliases:
+            args[i + 1] = value
+            return
+        if "=" not in sys_a:
+            continue
+        key = sys_a.split("=", 1)[0]
+        if key in aliases:
+            args[i] = f"{key}={value}"
             return
-    for a in arg:
-        for i, sys_a in enumerate(args):
-            if "=" not in sys_a:
-                continue
-            sys_a = sys_a.split("=")
-            if sys_a[0] == a:
-                args[i] = f"{a}={value}"
-                return
     raise ValueError(f"Argument {arg} not found in args.")
 
 
-file_ext_map = {
+file_ext_map = MappingProxyType({
     "adoc": "asciidoc",
     "bib": "bibtex",
     "dbk": "docbook",
@@ -137,7 +132,7 @@ file_ext_map = {
     "tex": "latex",
     "txt": "plain",
     "typ": "typst",
-}
+})
 
 
 def get_format(args) -> str:
@@ -183,7 +178,7 @@ def get_format(args) -> str:
                 raise ValueError("No output format or output file specified.")
         else:
             file_ext = Path(out_file).suffix
-            to_format = file_ext_map.get(file_ext[1:], None)
+            to_format = file_ext_map.get(file_ext.lstrip("."), None)
             if to_format is None:
                 raise ValueError(
                     f"Unknown output format: {file_ext}. Please specify the format with `--to`."
@@ -194,9 +189,9 @@ def get_format(args) -> str:
     return to_format
 
 
-logging_files = ["pyndoc.log", "pyndoc.filters.log", "pyndoc.server.log"]
+logging_files = [Path("pyndoc.log"), Path("pyndoc.filters.log"), Path("pyndoc.server.log")]
 
-return_codes = {
+return_codes = MappingProxyType({
     1:  "PandocIOError",
     3:  "PandocFailOnWarningError",
     4:  "PandocAppError",
@@ -227,7 +222,7 @@ return_codes = {
     97: "PandocCouldNotFindDataFileError",
     98: "PandocCouldNotFindMetadataFileError",
     99: "PandocResourceNotFound",
-}
+})
 
 
 def main():
@@ -241,10 +236,7 @@ def main():
 
     # remove the log files if they exist
     for log_file in logging_files:
-        try:
-            Path(log_file).unlink()
-        except FileNotFoundError:
-            pass
+        log_file.unlink(missing_ok=True)
 
     logging_level = get_arg(args, ("--log-level"), remove=True)
     start_logging(logging_level)
@@ -270,17 +262,16 @@ def main():
             # print(contents)
             return
 
-    check_filter_executable(Path(__file__).parent / "filter.py")
+    check_filter_executable(FILTER_FILE)
 
     # add the filter to the filters list
-    filter_file = Path(__file__).parent / "filter.py"
     current_filters = get_arg(args, ("--filter", "-F"))
     if current_filters is not None:
         current_filters = current_filters.split(",")
-        current_filters.append(str(filter_file))
+        current_filters.append(str(FILTER_FILE))
         replace_arg(args, ("--filter", "-F"), ",".join(current_filters))
     else:
-        args.append(f"--filter={filter_file}")
+        args.append(f"--filter={FILTER_FILE}")
 
     start_time = time.perf_counter_ns()
     logging.debug("Getting or starting server.")
@@ -288,26 +279,24 @@ def main():
     logging.debug(f"Server started on port {port}.")
     end_time = time.perf_counter_ns()
     logging.info(f"Server startup took {(end_time - start_time) / 1e6:.0f} ms.")
-    metadata_file = Path(".pyndoc.json")
     metadata = {"format": target_format, "port": port}
-    with metadata_file.open("w") as f:
+    with METADATA_FILE.open("w") as f:
         json.dump(metadata, f, indent=4)
 
     # run pandoc
     start_time = time.perf_counter_ns()
-    result = subprocess.run(["pandoc", *args], capture_output=True)
+    # pandoc's output goes straight to our stdout; only stderr is kept for error reporting
+    result = subprocess.run(["pandoc", *args], stderr=subprocess.PIPE)
     if result.returncode != 0:
         print(result.stderr.decode())
         raise Exception(f"Pandoc failed with return code {result.returncode}: {return_codes.get(result.returncode, 'Unknown error')}")
-    else:
-        print(result.stdout.decode())
     end_time = time.perf_counter_ns()
     logging.info(f"Pandoc took {(end_time - start_time) / 1e6:.0f} ms and returned {result.returncode}.")
     if to_preprocess:
         temp_file.unlink()
     stop_server(port)
     try:
-        metadata_file.unlink()
+        METADATA_FILE.unlink()
     except FileNotFoundError:
         logging.warning("Metadata file not found to delete.")
     
@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 
 import sys
+from functools import lru_cache
 from typing import Dict, Tuple
 import panflute
 import logging
@@ -9,12 +10,34 @@ import json
 
 from pyndoc.formats import Format
 import pyndoc.markdown as md
-import pyndoc.latex as tex
 import pyndoc.server_utils as server_utils
 
 
+@lru_cache(maxsize=None)
+def get_raw_format(target_format: Format) -> str:
+    """Get the format name to give raw elements for a target format. The target format
+    doesn't change during a run, so the result is cached.
+
+    Parameters
+    ----------
+    target_format : Format
+        The output format of the document
+
+    Returns
+    -------
+    str
+        The format of raw blocks and inlines which will be included in the output
+    """    
+    format = target_format.name.lower()
+    if format in ["revealjs", "chunkedhtml"]:
+        return "html"
+    if format == "beamer":
+        return "latex"
+    return format
+
+
 def handle_file(
-    file_path: str, classes: list, element_type: panflute.Element
+    file_path: str, classes: set, element_type: panflute.Element, is_block: bool
 ) -> panflute.Element:
     """Handle a file element. Reads the file and executes the contents,
     collecting any output to stdout and returning it as a raw block or inline
@@ -24,10 +47,12 @@ def handle_file(
     ----------
     file_path : str
         Path to the python file to execute
-    classes : list
+    classes : set
         Classes associated with the element
     element_type : panflute.Element
         Type of element to return (CodeBlock if block, Code if inline)
+    is_block : bool
+        Whether the element is a block (CodeBlock) rather than inline (Code)
 
     Returns
     -------
@@ -50,21 +75,12 @@ def handle_file(
     if "quiet" in classes:
         return []
 
-    constructor = (
-        panflute.RawBlock
-        if element_type == panflute.CodeBlock
-        else panflute.RawInline
-    )
-    format = md.TARGET_FORMAT.name.lower()
-    if format in ["revealjs", "chunkedhtml"]:
-        format = "html"
-    if format == "beamer":
-        format = "latex"
-    return constructor(response["message"], format=format)
+    constructor = panflute.RawBlock if is_block else panflute.RawInline
+    return constructor(response["message"], format=get_raw_format(md.TARGET_FORMAT))
 
 
 def handle_element(
-    code: str, classes: list, element_type: panflute.Element
+    code: str, classes: set, element_type: panflute.Element, is_block: bool
 ) -> panflute.Element:
     """Handle a code element. Evaluates the contents of the code block and returns 
     the output as a panflute element (inline or block as appropriate).
@@ -73,10 +89,12 @@ def handle_element(
     ----------
     code : str
         Code to execute
-    classes : list
+    classes : set
         Classes associated with the element
     element_type : panflute.Element
         Type of element to return (CodeBlock if block, Code if inline)
+    is_block : bool
+        Whether the element is a block (CodeBlock) rather than inline (Code)
 
     Returns
     -------
@@ -85,19 +103,19 @@ def handle_element(
     """    
     response = get_element_response(code)
     try:
-        response = json.loads(response)
+        # elements are converted bottom-up as the JSON is decoded
+        response = json.loads(response, object_hook=element_from_json)
     except json.JSONDecodeError:
         return element_type(f"Failed to decode response (invalid JSON): {response}")
+    except Exception as e:
+        return element_type(f"Error converting to panflute.Element: {e}")
     if response["type"] == "error":
         return element_type(f"Error running code: {response['message']}")
     if "quiet" in classes:
         # This shouldn't happen, but just in case we want it to behave as expected
         return []
     
-    try:
-        new_element = element_from_json(response["message"])
-    except Exception as e:
-        return element_type(f"Error converting to panflute.Element: {e}")
+    new_element = response["message"]
     logging.debug(f"Recieved {'block' if isinstance(new_element, panflute.Block) else 'inline'} element with classes {classes}")
     if "inline" in classes and isinstance(new_element, panflute.Block):
         # This has returned a block element, but was requested as an inline element. Convert to a Span
@@ -105,19 +123,23 @@ def handle_element(
     elif "block" in classes and isinstance(new_element, panflute.Inline):
         # This has returned an inline element, but was requested as a block element. Convert to a Para
         new_element = panflute.Para(new_element)
-    elif isinstance(new_element, panflute.Block) and element_type == panflute.Code:
-        logging.warning(f"Expected inline but recieved a block: \n\tCode: {code}\n\tResult: {panflute.stringify(new_element)}")
+    elif isinstance(new_element, panflute.Block) and not is_block:
+        if logging.getLogger().isEnabledFor(logging.WARNING):
+            logging.warning("Expected inline but recieved a block: \n\tCode: %s\n\tResult: %s", code, panflute.stringify(new_element))
     #     # This should probably have been an inline element, but was wrapped in a Para
         new_element = panflute.Span(*new_element.content)
-    elif isinstance(new_element, panflute.Inline) and element_type == panflute.CodeBlock:
-        logging.warning(f"Expected block but recieved an inline: \n\tCode: {code}\n\tResult: {panflute.stringify(new_element)}")
+    elif isinstance(new_element, panflute.Inline) and is_block:
+        if logging.getLogger().isEnabledFor(logging.WARNING):
+            logging.warning("Expected block but recieved an inline: \n\tCode: %s\n\tResult: %s", code, panflute.stringify(new_element))
     #     # This should probably have been a block element, but was wrapped in a Span
         new_element = panflute.Para(new_element)
     return new_element
 
 
-def element_from_json(object: Dict) -> panflute.Element:
-    """Convert a JSON object to a panflute element, appropriately handling nested elements.
+def element_from_json(object: Dict) -> panflute.Element | Dict:
+    """Convert a decoded JSON object to a panflute element. Intended to be used as the
+    `object_hook` for `json.loads`, so any nested elements will already have been converted
+    by the time their parent is reached.
 
     Parameters
     ----------
@@ -126,36 +148,15 @@ def element_from_json(object: Dict) -> panflute.Element:
 
     Returns
     -------
-    panflute.Element
-        The panflute element created from the JSON object
+    panflute.Element | Dict
+        The panflute element created from the JSON object, or the object unchanged if it 
+        does not describe an element
     """    
-    # Call panflute.elements.from_json() recursively to convert the entire object and all its children
-    logging.debug(f"Converting json to element: \n{json.dumps(object, indent = 2)}")
-    children = object.get("c", [])
-    if isinstance(children, list):
-        children = convert_children(children)
-    object["c"] = children
     return panflute.elements.from_json(object)
 
-def convert_children(children: list) -> list:
-    """Helper function to convert a list of children to panflute elements Should not be 
-    called directly.
-
-    Parameters
-    ----------
-    children : list
-        List of children to convert
-
-    Returns
-    -------
-    list
-        List of panflute elements created from the children
-    """    
-    return [element_from_json(child) if isinstance(child, dict) else convert_children(child) if isinstance(child, list) else child for child in children]
-
 
 def handle_raw(
-    code: str, classes: list, element_type: panflute.Element
+    code: str, classes: set, element_type: panflute.Element, is_block: bool
 ) -> panflute.Element:
     """Handle a raw code element. Executes the contents of the code block and returns
     the output ready to be inserted verbatim into the document.
@@ -164,10 +165,12 @@ def handle_raw(
     ----------
     code : str
         Code to execute
-    classes : list
+    classes : set
         Classes associated with the element
     element_type : panflute.Element
         Type of element to return (CodeBlock if block, Code if inline)
+    is_block : bool
+        Whether the element is a block (CodeBlock) rather than inline (Code)
 
     Returns
     -------
@@ -183,17 +186,16 @@ def handle_raw(
         return element_type(f"Error running code: {response['message']}")
     if "quiet" in classes:
         return []
-    constructor = (
-        panflute.RawBlock
-        if element_type == panflute.CodeBlock
-        else panflute.RawInline
-    )
-    format=md.TARGET_FORMAT.name.lower()
-    if format in ["revealjs", "chunkedhtml"]:
-        format = "html"
-    if format == "beamer":
-        format = "latex"
-    return constructor(response["message"], format=format)
+    constructor = panflute.RawBlock if is_block else panflute.RawInline
+    return constructor(response["message"], format=get_raw_format(md.TARGET_FORMAT))
+
+
+# checked in order, so that e.g. `py-file` takes priority over `py`
+code_handlers = {
+    "py-file": handle_file,
+    "py-md": handle_element,
+    "py": handle_raw,
+}
 
 
 def process_code(elem: panflute.Element) -> panflute.Element:
@@ -209,12 +211,11 @@ def process_code(elem: panflute.Element) -> panflute.Element:
     panflute.Element
         The output of the code execution as a panflute element, or an error message
     """    
-    if "py-file" in elem.classes:
-        return handle_file(elem.text.strip(), elem.classes, elem.__class__)
-    elif "py-md" in elem.classes:
-        return handle_element(elem.text.strip(), elem.classes, elem.__class__)
-    elif "py" in elem.classes:
-        return handle_raw(elem.text.strip(), elem.classes, elem.__class__)
+    classes = set(elem.classes)
+    is_block = isinstance(elem, panflute.CodeBlock)
+    for code_class, handler in code_handlers.items():
+        if code_class in classes:
+            return handler(elem.text.strip(), classes, elem.__class__, is_block)
 
 
 def get_string_response(code: str) -> str:
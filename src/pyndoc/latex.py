@@ -1,8 +1,11 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional, Set, Tuple, Dict, Any
+from decimal import Decimal, ROUND_HALF_UP
+from functools import lru_cache, singledispatch, wraps
+from typing import Callable, Iterable, List, Optional, Set, Tuple, Dict, Any
 import pint
 import math
 import re
+import threading
 
 ureg = pint.UnitRegistry()
 ureg.define("electronvolt = 1.602176634e-19 * joules = eV")
@@ -35,21 +38,184 @@ USE_EXP_FOR_EXPONENTIAL = False
 USE_ARC_FOR_INVERSE_TRIG = False
 
 
+@lru_cache(maxsize=256)
+def __format_unit_name(name: str) -> str:
+    # The abbreviated, escaped form of a single unit (e.g. "microsecond" -> "\mathrm{\mu s}"). Documents only use a handful of units, so these are only worked out once each.
+    u = f"{ureg.parse_units(name):~}"
+    u = u.replace("%", "\\%").replace("°", "^{\\circ}").replace("deg", "^{\\circ}").replace("μ", "\\mu")
+    return f"\\mathrm{{{u}}}"
+
+
 @pint.register_unit_format("T")
 def format_unit_simple(unit, registry, **options):
+    if len(unit) == 1:
+        # A single base unit (m, s, eV...) is the most common case
+        ((u, p),) = unit.items()
+        if p == 1:
+            return __format_unit_name(u)
     out = []
     for u, p in unit.items():
-        u = f"{ureg.parse_units(u):~}"
-        u = u.replace("%", "\\%").replace("°", "^{\\circ}").replace("deg", "^{\\circ}").replace("μ", "\\mu")
+        u = __format_unit_name(u)
         if p != 1:
-            p = str(int(p)) if float(p).is_integer() else str(float(p))
-            out.append(f"\\mathrm{{{u}}}^{{{p}}}")
+            p = str(int(p)) if p == int(p) else str(float(p))
+            out.append(f"{u}^{{{p}}}")
         else:
-            out.append(f"\\mathrm{{{u}}}")
+            out.append(u)
     return "\\,".join(out)
 
 
+def render_str(render: Callable[["Token"], str]) -> Callable[["Token"], str]:
+    """Decorator for `Token.__str__` which lets very deeply nested tokens (such as a long product built up with *) be rendered. Tokens are rendered recursively, but if that exceeds the recursion limit the outermost render starts again from the bottom up, rendering each token after the tokens it contains and keeping their strings until it finishes. Nothing is kept between renders, as tokens can be changed afterwards.
+    """
+    @wraps(render)
+    def __str__(self: "Token") -> str:
+        rendered = getattr(__local, "rendered", None)
+        if rendered is None:
+            return __render_outermost(self, render)
+        out = rendered.get(id(self))
+        if out is None:
+            out = render(self)
+        return out
+
+    return __str__
+
+
+# Whether this thread is part way through rendering or evaluating a token. Per thread, as the server handles each client in its own thread.
+__local = threading.local()
+
+
+def _child_tokens(token: "Token") -> List["Token"]:
+    # The tokens held in a token's _token_slots, including those inside lists, tuples, dicts and Arguments (as in the arguments of a Macro)
+    children = []
+    pending = [getattr(token, name, None) for name in token._token_slots]
+    while pending:
+        value = pending.pop()
+        if getattr(value, "_is_token", False):
+            children.append(value)
+        elif isinstance(value, (list, tuple)):
+            pending.extend(value)
+        elif isinstance(value, dict):
+            pending.extend(value.values())
+        elif isinstance(value, Argument):
+            pending.append(value.arg)
+    return children
+
+
+def __post_order(root: "Token", descend: Callable[["Token"], bool]):
+    # Iterative post-order traversal (with an explicit stack rather than recursion), so that every token comes after all of the tokens it contains. Only children for which descend() is true are visited.
+    seen = set()
+    stack = [(root, False)]
+    while stack:
+        token, expanded = stack.pop()
+        if expanded:
+            yield token
+        elif id(token) not in seen:
+            seen.add(id(token))
+            stack.append((token, True))
+            stack.extend((child, False) for child in _child_tokens(token) if descend(child))
+
+
+def __render_outermost(root: "Token", render: Callable[["Token"], str]) -> str:
+    # The strings of the tokens within this one, by id. The tokens are all part of the tree, so their ids can't be reused before the render ends.
+    rendered = __local.rendered = {}
+    try:
+        try:
+            return render(root)
+        except RecursionError:
+            # Too deeply nested to render recursively. Render from the bottom up instead, so that each token only needs the strings of the tokens it contains.
+            for token in __post_order(root, lambda child: True):
+                if token is not root:
+                    rendered[id(token)] = str(token)
+            return render(root)
+    finally:
+        __local.rendered = None
+
+
+def _evaluated(token: "Token", compute: Callable[[], Any]) -> Any:
+    # The value of an operation. Values aren't kept on the tokens, as any token in the tree can be changed afterwards, but each operation is only calculated once per evaluation (so that operations shared by canonicalize() are not repeated).
+    values = getattr(__local, "values", None)
+    if values is None:
+        return __evaluate_outermost(token, compute)
+    # Stored with the token, so that its id can't be reused by another one before the evaluation ends
+    evaluated = values.get(id(token))
+    if evaluated is not None:
+        return evaluated[1]
+    value = compute()
+    values[id(token)] = (token, value)
+    return value
+
+
+def __evaluate_outermost(root: "Token", compute: Callable[[], Any]) -> Any:
+    values = __local.values = {}
+    try:
+        try:
+            return compute()
+        except RecursionError:
+            # Too deeply nested to evaluate recursively (e.g. a long product of sums). Evaluate from the bottom up instead, so that each operation only needs the stored values of its operands.
+            values.clear()
+            for token in __post_order(root, lambda child: True):
+                if token is not root and token._memoises_value:
+                    token.value
+            return compute()
+    finally:
+        __local.values = None
+
+
+def __operator_key(token: "Token") -> tuple | None:
+    # Operators whose operands are the same objects and which render (and convert their units) the same way are interchangeable
+    if isinstance(token, _BinaryOperator):
+        return (type(token), id(token.left), id(token.right), token.symbol, token.precedence, token.group_left, token.group_right, getattr(token, "_unit", None))
+    if isinstance(token, _UnaryOperator):
+        return (type(token), id(token.right), getattr(token, "_unit", None))
+    return None
+
+
+def __with_representatives(value: Any, canonical: Dict[int, "Token"]) -> Any:
+    # The value of a token slot, with any operators in it (directly, or in lists, tuples, dicts and Arguments) replaced by their representatives. Lists, dicts and Arguments are changed in place, and tuples are rebuilt if anything in them is replaced.
+    if getattr(value, "_is_token", False):
+        return canonical.get(id(value), value)
+    if isinstance(value, list):
+        value[:] = [__with_representatives(v, canonical) for v in value]
+    elif isinstance(value, tuple):
+        items = tuple(__with_representatives(v, canonical) for v in value)
+        if any(new is not old for new, old in zip(items, value)):
+            return items
+    elif isinstance(value, dict):
+        for k, v in value.items():
+            value[k] = __with_representatives(v, canonical)
+    elif isinstance(value, Argument):
+        value.arg = __with_representatives(value.arg, canonical)
+    return value
+
+
+def _canonicalize(root: "Token") -> "Token":
+    canonical = {}
+    representative = {}
+    # Keep the replaced tokens alive until the end, so that their ids are not reused
+    replaced = []
+    for token in __post_order(root, lambda child: True):
+        # Children come first, so they have already been replaced by their representatives
+        for name in token._token_slots:
+            value = getattr(token, name, None)
+            new = __with_representatives(value, canonical)
+            if new is not value:
+                setattr(token, name, new)
+        key = __operator_key(token)
+        if key is not None:
+            canonical[id(token)] = representative.setdefault(key, token)
+            replaced.append(token)
+    return canonical.get(id(root), root)
+
+
 class Token(ABC):
+    __slots__ = ()
+    # Checked with getattr rather than isinstance, which is slow for ABCs and is on the path of every operator
+    _is_token = True
+    # The slots which hold other tokens (directly, or in lists, tuples, dicts or Arguments), for walking the tree without recursion
+    _token_slots = ()
+    # Whether the value is calculated from other tokens with _evaluated
+    _memoises_value = False
+
     @abstractmethod
     def __str__(self) -> str:
         pass
@@ -116,6 +282,16 @@ class Token(ABC):
     def __hash__(self) -> int:
         return hash(str(self))
 
+    def canonicalize(self) -> "Token":
+        """Merge repeated operations within this token, so that identical subexpressions (the same operation applied to the same tokens) are shared by a single object. Each shared operation is then only evaluated once, however many times it appears. The token is modified in place.
+
+        Returns
+        -------
+        Token
+            The canonical token, which should be used in place of this one.
+        """
+        return _canonicalize(self)
+
     def __eq__(self, other: Any) -> "Equality":
         return Equality(self, other)
 
@@ -136,6 +312,8 @@ class Token(ABC):
 
 
 class Literal(Token):
+    __slots__ = ("value",)
+
     def __init__(self, value: str | float) -> "Literal":
         """Contains a string or float to handle its behaviour for typsetting.
 
@@ -150,6 +328,8 @@ class Literal(Token):
         return str(self.value)
 
 class DimensionedLiteral(Literal):
+    __slots__ = ()
+
     # differentiates from a regular Literal so that operators like Power can bracket appropriately.
     def __init__(self, value: str | float) -> "DimensionedLiteral":
         """Contains a string or float to handle its behaviour for typsetting. This differs from a Literal in that it is assumed to also contain units, and so some operators may treat it differently for bracketing purposes.
@@ -162,6 +342,8 @@ class DimensionedLiteral(Literal):
         super().__init__(value)
 
 class CallableToken(Token, ABC):
+    __slots__ = ()
+
     @abstractmethod
     def __call__(self, *args: Any, **kwargs: Any) -> Literal:
         pass
@@ -194,6 +376,9 @@ __unit_prefixes = [
     "quetta",
 ]
 
+# Matches \{prefix}\ so that e.g. \centi\meter can be joined into centimeter
+__unit_prefix_pattern = re.compile(rf"\\({'|'.join(__unit_prefixes)})\s*\\")
+
 
 def parse_unit(unit: pint.Unit | str) -> pint.Unit:
     """Parses a unit string into a pint.Unit object. The unit string may be in siunitx syntax (`\meter\per\second\squared`), written fully (meter per second squared), or abbreviated (`m/s^2` or `m s^-2`).)
@@ -217,6 +402,12 @@ def parse_unit(unit: pint.Unit | str) -> pint.Unit:
         return unit
     if not isinstance(unit, str):
         raise TypeError(f"Expected pint.Unit or str, got {type(unit)}")
+    return __parse_unit_string(unit)
+
+
+@lru_cache(maxsize=1024)
+def __parse_unit_string(unit: str) -> pint.Unit:
+    # The same few unit strings are used throughout a document, so only parse each one once
     # unit could be in siunitx format. Check for backslashes:
     if "\\" in unit:
         # this is (probably) a siunitx unit
@@ -224,17 +415,33 @@ def parse_unit(unit: pint.Unit | str) -> pint.Unit:
         # replace \{prefix}\{unit} with {prefix}{unit}
         # replace backslash with space
         # check if it starts with "per " -- we need to handle this separately
-        for prefix in __unit_prefixes:
-            unit = re.sub(rf"\\{prefix}\s*\\", prefix, unit)
-        unit = unit.replace("\\", " ")
+        unit = __unit_prefix_pattern.sub(r"\1", unit)
+        unit = unit.replace("\\", " ").strip()
         if unit.startswith("per "):
             unit = unit[4:]
-            return 1 / ureg.parse_units(unit)
+            return ureg.parse_units(unit) ** -1
         return ureg.parse_units(unit)
     return ureg.parse_units(unit)
 
 
+def _format_argument(arg: str | Token | Dict[str, Any], is_optional: bool, in_expl3: bool) -> str:
+    # Shared by Argument and Macro, so that macros don't need to create an Argument for each argument every time they are rendered
+    open_delim, close_delim = ("[", "]") if is_optional else ("{", "}")
+    if isinstance(arg, dict):
+        pairs = [f"{key}={value}" for key, value in arg.items()]
+        if in_expl3:
+            pairs = [pair.replace(" ", "~") if " " in pair else pair for pair in pairs]
+        return f"{open_delim}{', '.join(pairs)}{close_delim}"
+
+    arg = str(arg)
+    if in_expl3 and " " in arg:
+        arg = arg.replace(" ", "~")
+    return f"{open_delim}{arg}{close_delim}"
+
+
 class Argument:
+    __slots__ = ("arg", "optional", "in_expl3")
+
     def __init__(
         self,
         arg: str | Token | Dict[str, Any],
@@ -257,24 +464,30 @@ class Argument:
         self.in_expl3 = in_expl3
 
     def __str__(self) -> str:
-        open_delim = "[" if self.optional else "{"
-        close_delim = "]" if self.optional else "}"
-
-        if isinstance(self.arg, dict):
-            if self.in_expl3:
-                arg = {
-                    key.replace(" ", "~"): value.replace(" ", "~")
-                    for key, value in self.arg.items()
-                }
-            return f"{open_delim}{', '.join([f'{key}={value}' for key, value in self.arg.items()])}{close_delim}"
-
-        arg = str(self.arg)
-        if self.in_expl3:
-            arg = arg.replace(" ", "~")
-        return f"{open_delim}{arg}{close_delim}"
+        if not self.optional and not self.in_expl3 and type(self.arg) is str:
+            return f"{{{self.arg}}}"
+        return _format_argument(self.arg, self.optional, self.in_expl3)
+
+
+def _format_arguments(arguments: Tuple[str | Tuple[str, bool] | Argument, ...], in_expl3: bool) -> str:
+    parts = []
+    for arg in arguments:
+        if not in_expl3 and (type(arg) is str or getattr(arg, "_is_token", False)):
+            # The usual case: a required argument which needs no substitution
+            parts.append(f"{{{arg}}}")
+        elif isinstance(arg, tuple):
+            parts.append(_format_argument(arg[0], arg[1], in_expl3))
+        elif isinstance(arg, Argument):
+            parts.append(str(arg))
+        else:
+            parts.append(_format_argument(arg, False, in_expl3))
+    return "".join(parts)
 
 
 class Macro(Token):
+    __slots__ = ("name", "arguments", "in_expl3")
+    _token_slots = ("arguments",)
+
     def __init__(self, name: str, *arguments: str | Tuple[str, bool] | Argument, in_expl3: bool = False):
         """A LaTeX macro, optionally with arguments.
 
@@ -291,19 +504,47 @@ class Macro(Token):
         self.arguments = arguments
         self.in_expl3 = in_expl3
 
+    @render_str
     def __str__(self) -> str:
-        out = "\\" + self.name
+        return f"\\{self.name}{_format_arguments(self.arguments, self.in_expl3)}"
 
-        for arg in self.arguments:
-            if isinstance(arg, tuple):
-                out += Argument(arg[1], arg[0], self.in_expl3).__str__()
-            else:
-                out += Argument(arg, self.in_expl3).__str__()
 
-        return out
+class _ConstantMacro(Macro):
+    __slots__ = ("_str",)
+
+    # An argument-less macro used for the module-level symbol constants, rendered once on creation
+    def __init__(self, name: str):
+        super().__init__(name)
+        self._str = f"\\{name}"
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+        if name == "name" and hasattr(self, "_str"):
+            # Renamed after creation
+            super().__setattr__("_str", f"\\{value}")
+
+    def __str__(self) -> str:
+        return self._str
+
+
+# Argument-free tokens used when building other tokens, shared rather than created each time
+_thin_space = _ConstantMacro(",")
+_differential = Macro("mathrm", "d")
+_to = _ConstantMacro("to")
+_exp = _ConstantMacro("exp")
+_euler = Macro("mathrm", "e")
+
+
+@lru_cache(maxsize=256)
+def _constant_macro(name: str) -> _ConstantMacro:
+    # Shared argument-free macros for names given as strings, such as the "int" of every Integral
+    return _ConstantMacro(name)
 
 
 class Environment(Token):
+    __slots__ = ("name", "arguments", "content", "in_expl3")
+    _token_slots = ("arguments", "content")
+
     def __init__(
         self,
         name: str,
@@ -329,19 +570,18 @@ class Environment(Token):
         self.content = content
         self.in_expl3 = in_expl3
 
+    @render_str
     def __str__(self) -> str:
-        out = Macro(
-            "begin", self.name, *self.arguments, in_expl3=self.in_expl3
-        ).__str__()
         if isinstance(self.content, (list, tuple)):
-            out += "".join([str(expr) for expr in self.content])
+            content = "".join(map(str, self.content))
         else:
-            out += str(self.content)
-        out += Macro("end", self.name).__str__()
-        return out
+            content = str(self.content)
+        return f"\\begin{{{self.name}}}{_format_arguments(self.arguments, self.in_expl3)}{content}\\end{{{self.name}}}"
 
 
 class Quantity(CallableToken):
+    __slots__ = ("_initial_value", "_initial_unit", "_fmt", "_unit", "_value")
+
     def __init__(
         self,
         value: float,
@@ -369,15 +609,17 @@ class Quantity(CallableToken):
         # this might not be necessary --  we'll see. We might need to track the
         # initial value so that we can always access the magnitude in the
         # original units.
-        i = 0
-        while isinstance(value, Token) and hasattr(value, "value") and i < 100: # this is a bit of a hack
-            value = value.value
-            i += 1
-        if i == 100:
-            raise ValueError("Encountered seemingly infinitely nested expressions when creating Quantity")
+        if getattr(value, "_is_token", False):
+            # Only tokens need unwrapping; plain numbers and pint quantities skip this entirely
+            i = 0
+            while getattr(value, "_is_token", False) and hasattr(value, "value") and i < 100: # this is a bit of a hack
+                value = value.value
+                i += 1
+            if i == 100:
+                raise ValueError("Encountered seemingly infinitely nested expressions when creating Quantity")
         self._initial_value = value
         self._initial_unit = unit
-        self.fmt = fmt
+        self._fmt = fmt
         if self._initial_unit is not None:
             self._unit = parse_unit(self._initial_unit)
             if isinstance(self._initial_value, pint.Quantity):
@@ -481,6 +723,10 @@ class Quantity(CallableToken):
         return int(self.value)
 
 
+# The exponent of a formatted float, without a + sign or leading zeros (e.g. e+05 -> 5)
+__exponent_pattern = re.compile(r"[eE]([+-]?)0*(\d+)$")
+
+
 def format_value(
     value: float | pint.Quantity,
     fmt: Optional[str] = None,
@@ -512,27 +758,29 @@ def format_value(
     # unit = None -> use the unit of the value
     # unit = "" -> no unit
     # Returns the formatted value and whether or not it has units (for bracketing purposes)
+    if unit == "":
+        unit, no_unit = None, True
+    else:
+        no_unit = False
+        if isinstance(unit, str):
+            # Parse once here, rather than separately for each use below
+            try:
+                unit = parse_unit(unit)
+            except Exception:
+                raise ValueError(f"Invalid unit: {unit}")
     if isinstance(value, pint.Quantity):
-        if unit is not None and unit != value.units and unit != "":
+        if unit is not None and unit != value.units:
             if value.dimensionless and not value.units == ureg.percent:
-                value = value * parse_unit(unit)
+                value = value * unit
             else:
                 try:
-                    value = value.to(parse_unit(unit))
+                    value = value.to(unit)
                 except pint.DimensionalityError:
                     raise ValueError(f"Cannot convert {value.units} to {unit}")
-        if unit == "":
+        if no_unit:
             value, unit = value.magnitude, None
         else:
             value, unit = value.magnitude, value.units
-    if isinstance(unit, str):
-        if unit == "":
-            unit = None
-        else:
-            try:
-                unit = parse_unit(unit)
-            except Exception:
-                raise ValueError(f"Invalid unit: {unit}")
     if fmt is None:
         fmt = DEFAULT_FORMAT
     if fmt is not None:
@@ -540,16 +788,13 @@ def format_value(
         print_value = f"{value:{fmt}}"
     else:
         print_value = f"{value}"
-    if "e" in print_value:
-        print_value, exponent = print_value.split("e")
-        exponent = str(int(exponent))
-    elif "E" in print_value:
-        print_value, exponent = print_value.split("E")
-        exponent = str(int(exponent))
-    else:
-        exponent = ""
-    if exponent == "0":
-        exponent = ""
+    exponent = ""
+    match = __exponent_pattern.search(print_value)
+    if match is not None:
+        print_value = print_value[:match.start()]
+        sign, digits = match.groups()
+        if digits != "0":
+            exponent = digits if sign != "-" else f"-{digits}"
     if fmt is None or "." not in fmt:
         print_value = __truncate_zeros(print_value)
     if exponent:
@@ -562,6 +807,50 @@ def format_value(
         return print_value, False
     return print_value + (f"\\ {format_unit(unit, si = USE_SIUNITX)}" if unit else ""), True
 
+def format_values(
+    values: Iterable[float | pint.Quantity] | pint.Quantity,
+    fmt: Optional[str] = None,
+    unit: Optional[pint.Unit | str] = None,
+) -> List[str]:
+    """Formats several values with the same format specifier and unit, such as a column of a table. This is equivalent to calling `format_value` on each value, but the unit is only parsed once, and a pint.Quantity array is converted to the unit in one go.
+
+    Parameters
+    ----------
+    values : Iterable[float | pint.Quantity] | pint.Quantity
+        The values to be formatted. This can be any iterable of values, or a pint.Quantity wrapping an array.
+    fmt : Optional[str], optional
+        The format specifier to use when rendering the values. If None, the default format specifier will be used. If `fmt = ''`, no format specifier will be used. Default None
+    unit : Optional[pint.Unit  |  str], optional
+        The unit to use when rendering the values, as for `format_value`. Default None
+
+    Returns
+    -------
+    List[str]
+        The formatted values, in the same order.
+
+    Raises
+    ------
+    TypeError
+        If a single value is given, rather than several. Use `format_value` to format a single value.
+    ValueError
+        If the unit is specified and the values have units, but the units are incompatible.
+    """
+    magnitude = values.magnitude if isinstance(values, pint.Quantity) else values
+    if not isinstance(magnitude, Iterable) or isinstance(magnitude, str):
+        raise TypeError(f"Expected several values, got {type(magnitude)}. Use format_value for a single value")
+    if isinstance(unit, str) and unit != "":
+        try:
+            unit = parse_unit(unit)
+        except Exception:
+            raise ValueError(f"Invalid unit: {unit}")
+    if isinstance(values, pint.Quantity) and isinstance(unit, pint.Unit) and not values.dimensionless:
+        try:
+            values = values.to(unit)
+        except pint.DimensionalityError:
+            raise ValueError(f"Cannot convert {values.units} to {unit}")
+    return [format_value(value, fmt, unit)[0] for value in values]
+
+
 def si(value: float | pint.Quantity, fmt: Optional[str] = None, unit: Optional[pint.Unit | str] = None, in_math_mode: bool = False) -> str:
     """Formats a value with SI units.
 
@@ -586,24 +875,25 @@ def si(value: float | pint.Quantity, fmt: Optional[str] = None, unit: Optional[p
     return "$" + format_value(value, fmt, unit)[0] + "$"
 
 def __truncate_zeros(value: str) -> str:
-    if "." in value:
-        integer, decimal = value.split(".")
-        if len(decimal) > AUTO_TRUNCATE_LENGTH:
-            decimal = int(decimal[: AUTO_TRUNCATE_LENGTH + 1])
-            # round to nearest 10
-            decimal = round(decimal, -1)
-            # check if we've rolled over to a new integer
-            if len(str(decimal)) > AUTO_TRUNCATE_LENGTH:
-                integer = str(int(integer) + 1)
-                decimal = ""  # decimal will always be 0 at this point
-        # remove trailing zeros
-        decimal = decimal.rstrip("0")
-        if decimal:
-            return f"{integer}.{decimal}"
-        return integer
-    return value
-
-
+    integer, point, decimal = value.partition(".")
+    if not point or not decimal.isdigit():
+        return value
+    if len(decimal) > AUTO_TRUNCATE_LENGTH:
+        # Decimal can't read a grouped integer part (as with fmt="," or "_"), so round the bare digits and group them again afterwards
+        sign = integer[:1] if integer[:1] in ("+", "-", " ") else ""
+        separator = "," if "," in integer else "_" if "_" in integer else ""
+        digits = integer[len(sign):].replace(separator, "") if separator else integer[len(sign):]
+        # Decimal rounds the digits as written, carrying into the integer part if needed (0.9999999 -> 1.000000)
+        rounded = Decimal(f"{digits}.{decimal}").quantize(Decimal(10) ** -AUTO_TRUNCATE_LENGTH, rounding=ROUND_HALF_UP)
+        integer, _, decimal = f"{rounded:f}".partition(".")
+        if separator:
+            integer = f"{int(integer):{separator}}"
+        value = f"{sign}{integer}.{decimal}"
+    # remove trailing zeros
+    return value.rstrip("0").rstrip(".")
+
+
+@lru_cache(maxsize=512)
 def format_unit(unit: pint.Unit, si: bool = False) -> str:
     """Formats a pint.Unit object.
 
@@ -659,6 +949,9 @@ def unit(unit: str | pint.Unit, in_math_mode: bool = False) -> str:
 
 
 class Variable(Quantity):
+    __slots__ = ("name",)
+    _token_slots = ("name",)
+
     def __init__(
         self,
         name: str,
@@ -686,6 +979,57 @@ class Variable(Quantity):
         return self.name.__str__()
 
 
+@singledispatch
+def __convert_to_token(value: Any) -> Token:
+    raise TypeError(f"Expected Token, str, or float, got {type(value)}")
+
+
+@__convert_to_token.register(pint.Quantity)
+def _(value: pint.Quantity) -> Token:
+    return Quantity(value.magnitude, unit=value.units)
+
+
+# Plain decimal numbers, with an optional sign and exponent. Not "inf" or "nan", which are more likely to be symbols.
+__number_pattern = re.compile(r"[+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?$")
+
+
+@__convert_to_token.register(str)
+def _(value: str) -> Token:
+    # A new Literal each time, rather than a shared one, as its value can be changed after creation
+    if __number_pattern.match(value):
+        number = float(value)
+        # if it's an integer, convert to int
+        if number.is_integer():
+            number = int(number)
+        return Quantity(number)
+    return Literal(value)
+
+
+@__convert_to_token.register(float)
+def _(value: float) -> Token:
+    return Quantity(value)
+
+
+@__convert_to_token.register(int)
+def _(value: int) -> Token:
+    return Quantity(value, fmt="d")
+
+
+@__convert_to_token.register(list)
+def _(value: list) -> Token:
+    return SquareBracket(*value, scale=True)
+
+
+@__convert_to_token.register(tuple)
+def _(value: tuple) -> Token:
+    return Bracket(*value, scale=True)
+
+
+@__convert_to_token.register(set)
+def _(value: set) -> Token:
+    return CurlyBracket(*value, scale=True)
+
+
 def as_token(value: Token | str | float | List | Tuple | Set | pint.Quantity) -> Token:
     """Converts a value to a Token or subclass.
 
@@ -704,48 +1048,48 @@ def as_token(value: Token | str | float | List | Tuple | Set | pint.Quantity) ->
     TypeError
         If the value cannot be converted to a Token.
     """    
-    if isinstance(value, Token):
+    if getattr(value, "_is_token", False):
         return value
+    return __convert_to_token(value)
+
+
+def _in_unit(value: Any, unit: pint.Unit | str | None) -> Any:
+    # An operation's value, converted to the unit given to its unit setter (if any) each time it is recalculated
+    return value if unit is None else value.to(unit)
+
+
+def _value_quantity(token: "Token") -> "Quantity":
+    # The Quantity used to render an operation's value. It is kept (in the token's _quantity slot) until the value changes, as creating it means parsing the unit again.
+    value = token.value
+    cached = getattr(token, "_quantity", None)
+    if cached is not None and cached[0] is value:
+        return cached[1]
     if isinstance(value, pint.Quantity):
-        return Quantity(value.magnitude, unit=value.units)
-    if isinstance(value, str):
-        if value.isnumeric():
-            value = float(value)
-            # if it's an integer, convert to int
-            if value.is_integer():
-                value = int(value)
-            return Quantity(value)
-        return Literal(value)
-    if isinstance(value, float):
-        return Quantity(value)
-    if isinstance(value, int):
-        return Quantity(value, fmt="d")
-    if isinstance(value, list):
-        return SquareBracket(*[as_token(v) for v in value], scale=True)
-    if isinstance(value, tuple):
-        return Bracket(*[as_token(v) for v in value], scale=True)
-    if isinstance(value, set):
-        return CurlyBracket(*[as_token(v) for v in value], scale=True)
+        quantity = Quantity(value.magnitude, unit=value.units)
+    else:
+        quantity = Quantity(value)
+    token._quantity = (value, quantity)
+    return quantity
 
-    raise TypeError(f"Expected Token, str, or float, got {type(value)}")
 
 symbol = as_token
 sym = as_token
 
 class _UnaryOperator(Quantity, ABC):
+    __slots__ = ("right", "_quantity")
+    _token_slots = ("right",)
+    _memoises_value = True
+    symbol = ""
+
     def __init__(self, value: CallableToken | str | float) -> "_UnaryOperator":
         self.right = as_token(value)
-        self.symbol = ""
-        self._value = None
 
+    @render_str
     def __str__(self) -> str:
         return f"{self.symbol}{{{self.right}}}"
 
     def __call__(self, *args: Any, **kwargs: Any) -> Literal:
-        value = self.value
-        if isinstance(value, pint.Quantity):
-            return Quantity(value.magnitude, unit=value.units)(*args, **kwargs)
-        return Quantity(value)(*args, **kwargs)
+        return _value_quantity(self)(*args, **kwargs)
 
     @abstractmethod
     def _operation(self, value: CallableToken) -> Any:
@@ -754,34 +1098,36 @@ class _UnaryOperator(Quantity, ABC):
 
     @property
     def value(self) -> Any:
-        if self._value is None:
-            self._value = self._operation(
-                self.right
-            ) 
-        return self._value
+        return _evaluated(self, lambda: _in_unit(self._operation(self.right), getattr(self, "_unit", None)))
 
     @property
     def unit(self) -> pint.Unit:
-        if isinstance(self.value, Quantity):
-            return self.value.unit
-        elif isinstance(self.value, pint.Quantity):
-            return self.value.units
+        value = self.value
+        if isinstance(value, Quantity):
+            return value.unit
+        elif isinstance(value, pint.Quantity):
+            return value.units
         return None
 
     @unit.setter
     def unit(self, unit: pint.Unit | str):
-        if isinstance(self.value, Quantity):
-            self.value.unit = unit
-        elif isinstance(self.value, pint.Quantity):
-            self._value = self.value.to(unit)
+        value = self.value
+        if isinstance(value, Quantity):
+            value.unit = unit
+        elif isinstance(value, pint.Quantity):
+            value.to(unit)  # check that the unit is compatible before keeping it
+            self._unit = unit
         else:
-            raise ValueError(f"Cannot set unit of non-Quantity of type {str(type(self.value)).replace('<', '').replace('>', '')}")
+            raise ValueError(f"Cannot set unit of non-Quantity of type {str(type(value)).replace('<', '').replace('>', '')}")
 
     def as_quantity(self) -> Quantity:
         return Quantity(self.value)
 
 
 class Negation(_UnaryOperator):
+    __slots__ = ()
+    symbol = "-"
+
     def __init__(self, value: CallableToken | str | float) -> "Negation":
         """Negates a value, such as `-a`.
 
@@ -791,13 +1137,15 @@ class Negation(_UnaryOperator):
             The value to be negated
         """        
         super().__init__(value)
-        self.symbol = "-"
 
     def _operation(self, value: CallableToken) -> Any:
         return -value.value
 
 
 class Positive(_UnaryOperator):
+    __slots__ = ()
+    symbol = "+"
+
     def __init__(self, value: CallableToken | str | float) -> "Positive":
         """Returns the positive value of a quantity, such as `+a`. This is numerically equivalent to `a`, and only differs in rendering. It is *not* equivalent to `abs(a)`. Use `absolute(a)` for the absolute value.
 
@@ -807,13 +1155,16 @@ class Positive(_UnaryOperator):
             The value.
         """
         super().__init__(value)
-        self.symbol = "+"
 
     def _operation(self, value: CallableToken) -> Any:
         return value.value
 
 
 class _BinaryOperator(CallableToken, ABC):
+    __slots__ = ("left", "right", "symbol", "precedence", "group_left", "group_right", "_unit", "_quantity")
+    _token_slots = ("left", "right")
+    _memoises_value = True
+
     def __init__(
         self,
         left: CallableToken | str | float,
@@ -826,11 +1177,14 @@ class _BinaryOperator(CallableToken, ABC):
         self.group_left = False
         self.group_right = False
         # super().__init__(self.value)
-        self._value = None
 
+    @render_str
     def __str__(self) -> str:
         left = f"{{{self.left}}}" if self.group_left else f"{self.left}"
         right = f"{{{self.right}}}" if self.group_right else f"{self.right}"
+        # An empty symbol (implicit multiplication) is separated by a single space, which is still needed after macros
+        if not self.symbol:
+            return f"{left} {right}"
         return f"{left} {self.symbol} {right}"
 
     def __call__(self, *args: Any, **kwargs: Any) -> Literal:
@@ -841,10 +1195,7 @@ class _BinaryOperator(CallableToken, ABC):
         Literal
             The rendered value.
         """        
-        value = self.value
-        if isinstance(value, pint.Quantity):
-            return Quantity(value.magnitude, unit=value.units)(*args, **kwargs)
-        return Quantity(value)(*args, **kwargs)
+        return _value_quantity(self)(*args, **kwargs)
 
     @abstractmethod
     def _operation(self, left: CallableToken, right: CallableToken) -> Any:
@@ -854,28 +1205,27 @@ class _BinaryOperator(CallableToken, ABC):
 
     @property
     def value(self) -> Any:
-        if self._value is None:
-            self._value = self._operation(
-                self.left, self.right
-            ) 
-        return self._value
+        return _evaluated(self, lambda: _in_unit(self._operation(self.left, self.right), getattr(self, "_unit", None)))
 
     @property
     def unit(self) -> pint.Unit:
-        if isinstance(self.value, Quantity):
-            return self.value.unit
-        elif isinstance(self.value, pint.Quantity):
-            return self.value.units
+        value = self.value
+        if isinstance(value, Quantity):
+            return value.unit
+        elif isinstance(value, pint.Quantity):
+            return value.units
         return None
 
     @unit.setter
     def unit(self, unit: pint.Unit | str):
-        if isinstance(self.value, Quantity):
-            self.value.unit = unit
-        elif isinstance(self.value, pint.Quantity):
-            self._value = self.value.to(unit)
+        value = self.value
+        if isinstance(value, Quantity):
+            value.unit = unit
+        elif isinstance(value, pint.Quantity):
+            value.to(unit)  # check that the unit is compatible before keeping it
+            self._unit = unit
         else:
-            raise ValueError(f"Cannot set unit of non-Quantity of type {str(type(self.value)).replace('<', '').replace('>', '')}")
+            raise ValueError(f"Cannot set unit of non-Quantity of type {str(type(value)).replace('<', '').replace('>', '')}")
 
     def as_quantity(self) -> Quantity:
         """Convert the operation object to a Quantity with the value and units of the operation.
@@ -887,7 +1237,22 @@ class _BinaryOperator(CallableToken, ABC):
         """        
         return Quantity(self.value)
 
+def _chain_operands(token: "_BinaryOperator") -> List["Token"]:
+    # The operands of a left-nested chain of the same operation, e.g. [a, b, c, d] for ((a + b) + c) + d. Stops at any operation which has already been evaluated, or which is converted to its own unit.
+    values = __local.values
+    operands = []
+    while type(token.left) is type(token) and id(token.left) not in values and getattr(token.left, "_unit", None) is None:
+        operands.append(token.right)
+        token = token.left
+    operands.append(token.right)
+    operands.append(token.left)
+    operands.reverse()
+    return operands
+
+
 class Addition(_BinaryOperator):
+    __slots__ = ()
+
     def __init__(
         self, left: CallableToken | str | float, right: CallableToken | str | float
     ) -> "Addition":
@@ -905,10 +1270,17 @@ class Addition(_BinaryOperator):
         self.precedence = 1
 
     def _operation(self, left: CallableToken, right: CallableToken) -> Any:
-        return left.value + right.value
+        # Sum a + b + c + ... in a single loop, rather than recursing through each Addition in turn
+        operands = _chain_operands(self)
+        total = operands[0].value
+        for operand in operands[1:]:
+            total = total + operand.value
+        return total
 
 
 class Subtraction(_BinaryOperator):
+    __slots__ = ()
+
     def __init__(
         self, left: CallableToken | str | float, right: CallableToken | str | float
     ) -> "Subtraction":
@@ -930,6 +1302,8 @@ class Subtraction(_BinaryOperator):
 
 
 class Multiplication(_BinaryOperator):
+    __slots__ = ()
+
     def __init__(
         self, left: CallableToken | str | float, right: CallableToken | str | float
     ) -> "Multiplication":
@@ -947,10 +1321,16 @@ class Multiplication(_BinaryOperator):
         self.precedence = 2
 
     def _operation(self, left: CallableToken, right: CallableToken) -> Any:
-        return left.value * right.value
+        operands = _chain_operands(self)
+        product = operands[0].value
+        for operand in operands[1:]:
+            product = product * operand.value
+        return product
 
 
 class Times(_BinaryOperator):
+    __slots__ = ()
+
     def __init__(
         self, left: CallableToken | str | float, right: CallableToken | str | float
     ) -> "Times":
@@ -972,6 +1352,8 @@ class Times(_BinaryOperator):
 
 
 class Division(_BinaryOperator):
+    __slots__ = ()
+
     def __init__(
         self,
         left: CallableToken | str | float,
@@ -1001,11 +1383,14 @@ class Division(_BinaryOperator):
     def _operation(self, left: CallableToken, right: CallableToken) -> Any:
         return left.value / right.value
 
+    @render_str
     def __str__(self) -> str:
         return f"{self.symbol}{{{self.left}}}{{{self.right}}}"
 
 
 class Power(_BinaryOperator):
+    __slots__ = ()
+
     def __init__(
         self,
         left: CallableToken | str | float,
@@ -1024,7 +1409,7 @@ class Power(_BinaryOperator):
         self.symbol = "^"
         self.precedence = 3
         self.group_right = True
-        if not isinstance(left, Index):
+        if type(left) is not Index:
             self.group_left = True
         if isinstance(self.left, DimensionedLiteral):
             self.left = Bracket(self.left, scale=True) # Should this be in the string conversion rather than here? Would mean changes to _BinaryOperator or a separate __str__ for Power.
@@ -1034,6 +1419,8 @@ class Power(_BinaryOperator):
 
 
 class Index(_BinaryOperator):
+    __slots__ = ()
+
     def __init__(
         self,
         left: CallableToken | str | float,
@@ -1052,7 +1439,7 @@ class Index(_BinaryOperator):
         self.symbol = "_"
         self.precedence = 3
         self.group_right = True
-        if not isinstance(left, Power):
+        if type(left) is not Power:
             self.group_left = True
 
     def _operation(self, left: CallableToken, right: CallableToken) -> None:
@@ -1060,19 +1447,25 @@ class Index(_BinaryOperator):
 
 
 class Concatenation(Token):
+    __slots__ = ("args",)
+    _token_slots = ("args",)
     # non callable
     def __init__(self, *args: CallableToken) -> "Concatenation":
         """Concatenates a number of values together, such as `Concatenation(a, b, c)` --> `abc`.
         """        
         self.args = args
 
+    @render_str
     def __str__(self) -> str:
-        return " ".join(str(arg) for arg in self.args)
+        return " ".join(map(str, self.args))
 
 
 class _Container(CallableToken, ABC):
+    __slots__ = ("children",)
+    _token_slots = ("children",)
+
     def __init__(self, *children: str | float | Token) -> "_Container":
-        self.children = [as_token(child) for child in children]
+        self.children = list(map(as_token, children))
 
     @abstractmethod
     def __str__(self) -> str:
@@ -1101,11 +1494,20 @@ class _Container(CallableToken, ABC):
 
 
 class Sequence(_Container):
+    __slots__ = ()
+
+    @render_str
     def __str__(self) -> str:
-        return ", ".join(str(child) for child in self.children)
+        return ", ".join(map(str, self.children))
 
 
 class Bracket(_Container):
+    __slots__ = ("scale",)
+    left_bracket = "("
+    right_bracket = ")"
+    _scaled_left = "\\left("
+    _scaled_right = "\\right)"
+
     def __init__(
         self, *children: str | float | Token, scale: bool = False
     ) -> "Bracket":
@@ -1118,63 +1520,69 @@ class Bracket(_Container):
         """        
         super().__init__(*children)
         self.scale = scale
-        self.left_bracket = "("
-        self.right_bracket = ")"
 
+    @render_str
     def __str__(self) -> str:
-        scale_left, scale_right = ("\\left", "\\right") if self.scale else ("", "")
-        return f"{scale_left}{self.left_bracket} {', '.join(str(child) for child in self.children)} {scale_right}{self.right_bracket}"
+        children = self.children
+        # Most brackets hold a single expression, which doesn't need joining
+        content = children[0] if len(children) == 1 else ", ".join(map(str, children))
+        if self.scale:
+            return f"{self._scaled_left} {content} {self._scaled_right}"
+        return f"{self.left_bracket} {content} {self.right_bracket}"
 
 
 class SquareBracket(Bracket):
-    def __init__(
-        self, *children: str | float | Token, scale: bool = False
-    ) -> "SquareBracket":
-        """A square bracketed expression, such as `[a + b]`.
+    """A square bracketed expression, such as `[a + b]`.
 
-        Parameters
-        ----------
-        scale : bool, optional
-            If True, the brackets will be scaled to fit the contents. Default False
-        """        
-        super().__init__(*children, scale=scale)
-        self.left_bracket = "["
-        self.right_bracket = "]"
+    Parameters
+    ----------
+    scale : bool, optional
+        If True, the brackets will be scaled to fit the contents. Default False
+    """
+    __slots__ = ()
+    left_bracket = "["
+    right_bracket = "]"
+    _scaled_left = "\\left["
+    _scaled_right = "\\right]"
 
 
 class CurlyBracket(Bracket):
-    def __init__(
-        self, *children: str | float | Token, scale: bool = False
-    ) -> "CurlyBracket":
-        """A curly bracketed/braced expression, such as `{a + b}`.
+    """A curly bracketed/braced expression, such as `{a + b}`.
 
-        Parameters
-        ----------
-        scale : bool, optional
-            If True, the brackets will be scaled to fit the contents. Default False
-        """
-        super().__init__(*children, scale=scale)
-        self.left_bracket = "\\lbrace"
-        self.right_bracket = "\\rbrace"
+    Parameters
+    ----------
+    scale : bool, optional
+        If True, the brackets will be scaled to fit the contents. Default False
+    """
+    __slots__ = ()
+    left_bracket = "\\lbrace"
+    right_bracket = "\\rbrace"
+    _scaled_left = "\\left\\lbrace"
+    _scaled_right = "\\right\\rbrace"
 
 
 class AngleBracket(Bracket):
-    def __init__(
-        self, *children: str | float | Token, scale: bool = False
-    ) -> "AngleBracket":
-        """An angle bracketed expression, such as `<a + b>`.
+    """An angle bracketed expression, such as `<a + b>`.
 
-        Parameters
-        ----------
-        scale : bool, optional
-            If True, the brackets will be scaled to fit the contents. Default False
-        """
-        super().__init__(*children, scale=scale)
-        self.left_bracket = "\\langle"
-        self.right_bracket = "\\rangle"
+    Parameters
+    ----------
+    scale : bool, optional
+        If True, the brackets will be scaled to fit the contents. Default False
+    """
+    __slots__ = ()
+    left_bracket = "\\langle"
+    right_bracket = "\\rangle"
+    _scaled_left = "\\left\\langle"
+    _scaled_right = "\\right\\rangle"
 
 
 class AbsoluteValue(Bracket):
+    __slots__ = ("_quantity",)
+    left_bracket = "|"
+    right_bracket = "|"
+    _scaled_left = "\\left|"
+    _scaled_right = "\\right|"
+
     def __init__(
         self, *children: str | float | Token, scale: bool = False
     ) -> "AbsoluteValue":
@@ -1186,23 +1594,21 @@ class AbsoluteValue(Bracket):
             If True, the brackets will be scaled to fit the contents. Default False
         """
         super().__init__(*children, scale=scale)
-        self.left_bracket = "|"
-        self.right_bracket = "|"
-        if self.value < 0:
-            self._value = -self.value # seems like the safest way to do this when value could be anything
-        else:
-            self._value = self.value
+
+    @property
+    def value(self) -> Any:
+        # Calculated when needed, so that symbolic contents (which have no numerical value) can still be typeset
+        value = super().value
+        return None if value is None else abs(value)
 
     # This one can actually be called!
     def __call__(self, *args: Any, **kwargs: Any) -> Literal:
-        value = self._value
-
-        if isinstance(value, pint.Quantity):
-            return Quantity(value.magnitude, unit=value.units)(*args, **kwargs)
-        return Quantity(value)(*args, **kwargs)
+        return _value_quantity(self)(*args, **kwargs)
 
 
 class _BooleanBinaryOperator(_BinaryOperator):
+    __slots__ = ()
+
     def __init__(
         self, left: CallableToken | str | float, right: CallableToken | str | float
     ) -> "_BooleanBinaryOperator":
@@ -1210,8 +1616,7 @@ class _BooleanBinaryOperator(_BinaryOperator):
         self.precedence = 1
 
     def __call__(self, *args: Any, **kwargs: Any) -> Literal:
-        value = self._operation(self.left, self.right)
-        return Literal(str(value))
+        return Literal(str(self.value))
 
     @abstractmethod
     def _operation(self, left: CallableToken, right: CallableToken) -> bool:
@@ -1219,6 +1624,8 @@ class _BooleanBinaryOperator(_BinaryOperator):
 
 
 class Equality(_BooleanBinaryOperator):
+    __slots__ = ()
+
     def __init__(
         self, left: CallableToken | str | float, right: CallableToken | str | float
     ) -> "Equality":
@@ -1239,6 +1646,8 @@ class Equality(_BooleanBinaryOperator):
 
 
 class LessThan(_BooleanBinaryOperator):
+    __slots__ = ()
+
     def __init__(
         self, left: CallableToken | str | float, right: CallableToken | str | float
     ) -> "LessThan":
@@ -1259,6 +1668,8 @@ class LessThan(_BooleanBinaryOperator):
 
 
 class GreaterThan(_BooleanBinaryOperator):
+    __slots__ = ()
+
     def __init__(
         self, left: CallableToken | str | float, right: CallableToken | str | float
     ) -> "GreaterThan":
@@ -1279,6 +1690,8 @@ class GreaterThan(_BooleanBinaryOperator):
 
 
 class LessThanOrEqual(_BooleanBinaryOperator):
+    __slots__ = ()
+
     def __init__(
         self, left: CallableToken | str | float, right: CallableToken | str | float
     ) -> "LessThanOrEqual":
@@ -1299,6 +1712,8 @@ class LessThanOrEqual(_BooleanBinaryOperator):
 
 
 class GreaterThanOrEqual(_BooleanBinaryOperator):
+    __slots__ = ()
+
     def __init__(
         self, left: CallableToken | str | float, right: CallableToken | str | float
     ) -> "GreaterThanOrEqual":
@@ -1319,6 +1734,8 @@ class GreaterThanOrEqual(_BooleanBinaryOperator):
 
 
 class NotEqual(_BooleanBinaryOperator):
+    __slots__ = ()
+
     def __init__(
         self, left: CallableToken | str | float, right: CallableToken | str | float
     ) -> "NotEqual":
@@ -1339,6 +1756,8 @@ class NotEqual(_BooleanBinaryOperator):
 
 
 class Approximation(_BooleanBinaryOperator):
+    __slots__ = ()
+
     def __init__(
         self, left: CallableToken | str | float, right: CallableToken | str | float
     ) -> "Approximation":
@@ -1359,6 +1778,9 @@ class Approximation(_BooleanBinaryOperator):
 
 
 class LimitsExpression(Token):
+    __slots__ = ("value", "function", "lower", "upper", "expr", "suffix")
+    _token_slots = ("function", "lower", "upper", "expr", "suffix")
+
     def __init__(
         self,
         function: Macro | Token | str,
@@ -1384,25 +1806,30 @@ class LimitsExpression(Token):
         """        
         self.value = None
         if isinstance(function, str):
-            function = Macro(function)
+            function = _constant_macro(function)
         self.function = function
         self.lower = None if lower is None else as_token(lower)
         self.upper = None if upper is None else as_token(upper)
         self.expr = as_token(expr)
         self.suffix = None if suffix is None else as_token(suffix)
 
+    @render_str
     def __str__(self) -> str:
-        suffix = "" if self.suffix is None else str(self.suffix)
-        if self.lower is None and self.upper is None:
+        lower, upper = self.lower, self.upper
+        suffix = "" if self.suffix is None else self.suffix
+        if lower is None and upper is None:
             return f"{self.function} {self.expr} {suffix}"
-        if self.lower is None:
-            return f"{self.function} \\limits ^{{{self.upper}}} {self.expr} {suffix}"
-        if self.upper is None:
-            return f"{self.function} \\limits _{{{self.lower}}} {self.expr} {suffix}"
-        return f"{self.function} \\limits _{{{self.lower}}} ^{{{self.upper}}} {self.expr} {suffix}"
+        limits = "\\limits"
+        if lower is not None:
+            limits = f"{limits} _{{{lower}}}"
+        if upper is not None:
+            limits = f"{limits} ^{{{upper}}}"
+        return f"{self.function} {limits} {self.expr} {suffix}"
 
 
 class Integral(LimitsExpression):
+    __slots__ = ()
+
     def __init__(
         self,
         expr: Token | Any,
@@ -1424,10 +1851,12 @@ class Integral(LimitsExpression):
             The variable of integration, such as `x` which will be rendered as `dx`, by default None
         """        
         super().__init__(
-            "int", expr, lower, upper, Macro(",") & Macro("mathrm", "d") & variable
+            "int", expr, lower, upper, None if variable is None else Concatenation(_thin_space, _differential, as_token(variable))
         )
 
 class Limit(LimitsExpression):
+    __slots__ = ()
+
     def __init__(
         self,
         expr: Token | Any,
@@ -1447,7 +1876,7 @@ class Limit(LimitsExpression):
         """        
         lower_expr = None
         if variable is not None and limit is not None:
-            lower_expr = as_token(variable) & Macro("to") & as_token(limit)
+            lower_expr = as_token(variable) & _to & as_token(limit)
         elif variable is not None:
             lower_expr = as_token(variable)
         elif limit is not None:
@@ -1457,6 +1886,8 @@ class Limit(LimitsExpression):
         )
     
 class Summation(LimitsExpression):
+    __slots__ = ()
+
     def __init__(
         self,
         expr: Token | Any,
@@ -1492,6 +1923,9 @@ class Summation(LimitsExpression):
 
 
 class NthRoot(CallableToken):
+    __slots__ = ("value", "root")
+    _token_slots = ("value", "root")
+
     def __init__(
         self, value: Token | str | float, root: Token | str | float
     ) -> "NthRoot":
@@ -1507,13 +1941,25 @@ class NthRoot(CallableToken):
         self.value = as_token(value)
         self.root = as_token(root)
 
+    @render_str
     def __str__(self) -> str:
         if self.root.value == 2:
             return f"\\sqrt{{{self.value}}}"
         return f"\\sqrt[{self.root}]{{{self.value}}}"
 
     def __call__(self, *args: Any, **kwargs: Any) -> Literal:
-        return Quantity(self.value.value ** (1 / self.root.value))(*args, **kwargs)
+        value, root = self.value.value, self.root.value
+        if root == 2 and isinstance(value, (int, float)) and value >= 0:
+            # Exact for perfect squares, and avoids raising to the (inexact) power of 0.5
+            if isinstance(value, int):
+                result = math.isqrt(value)
+                if result * result != value:
+                    result = math.sqrt(value)
+            else:
+                result = math.sqrt(value)
+        else:
+            result = value ** (1 / root)
+        return Quantity(result)(*args, **kwargs)
 
 
 def sqrt(value: Token | str | float) -> NthRoot:
@@ -1549,6 +1995,14 @@ def cbrt(value: Token | str | float) -> NthRoot:
 
 
 class _TrigFunction(CallableToken, ABC):
+    __slots__ = ("name", "expr", "power", "inverse", "_quantity")
+    _token_slots = ("expr", "power")
+    _memoises_value = True
+    # The function of a single float, such as math.sin, which each subclass applies to its operand
+    _function: Callable[[float], float]
+    # Whether the result is the reciprocal of _function, as for csc, sec, cot, etc.
+    _reciprocal = False
+
     # Not all of these are actually trig functions, but behave the same for formatting purposes
     def __init__(
         self,
@@ -1562,38 +2016,36 @@ class _TrigFunction(CallableToken, ABC):
         self.power = None if power is None else as_token(power)
         self.inverse = inverse
 
+    @render_str
     def __str__(self) -> str:
+        body = f"\\left( {self.expr} \\right)"
         if self.inverse:
+            inverse = f"{{\\{self.name}}} ^ {{-1}}{body}"
             if self.power is None:
-                return _Container(
-                    Power(Macro(self.name), as_token(-1)), Bracket(self.expr, scale=True)
-                )
-            return Power(
-                Bracket(
-                    _Container(
-                        Power(Macro(self.name), as_token(-1)), Bracket(self.expr, scale=True)
-                    )
-                ),
-                self.power
-            )
+                return inverse
+            return f"{{( {inverse} )}} ^ {{{self.power}}}"
         if self.power is None:
-            return _Container(Macro(self.name), Bracket(self.expr, scale=True))
-        return _Container(
-            Power(Macro(self.name), self.power), Bracket(self.expr, scale=True)
-        )
+            return f"\\{self.name}{body}"
+        return f"{{\\{self.name}}} ^ {{{self.power}}}{body}"
 
     def __call__(self, *args: Any, **kwargs: Any) -> Literal:
-        value = self._operation(self.expr, self.power)
-        if isinstance(value, pint.Quantity):
-            return Quantity(value.magnitude, unit=value.units)(*args, **kwargs) 
-        return Quantity(value)(*args, **kwargs) 
+        return _value_quantity(self)(*args, **kwargs)
+
+    @property
+    def value(self) -> float:
+        return _evaluated(self, lambda: self._operation(self.expr, self.power))
 
-    @abstractmethod
     def _operation(self, expr: Token, power: Token) -> Any:
-        pass
+        value = self._function(expr.value)
+        if self._reciprocal:
+            return 1 / value if power is None else value ** -power.value
+        return value if power is None else value ** power.value
 
 
 class Sine(_TrigFunction):
+    __slots__ = ()
+    _function = staticmethod(math.sin)
+
     def __init__(
         self, expr: Token | str, power: Optional[Token | Any] = None
     ) -> "Sine":
@@ -1608,11 +2060,11 @@ class Sine(_TrigFunction):
         """        
         super().__init__("sin", expr, power)
 
-    def _operation(self, expr: Token, power: Token) -> Any:
-        return math.sin(expr.value) ** (1 if power is None else power.value)
-
 
 class Cosine(_TrigFunction):
+    __slots__ = ()
+    _function = staticmethod(math.cos)
+
     def __init__(
         self, expr: Token | str, power: Optional[Token | Any] = None
     ) -> "Cosine":
@@ -1627,11 +2079,11 @@ class Cosine(_TrigFunction):
         """
         super().__init__("cos", expr, power)
 
-    def _operation(self, expr: Token, power: Token) -> Any:
-        return math.cos(expr.value) ** (1 if power is None else power.value)
-
 
 class Tangent(_TrigFunction):
+    __slots__ = ()
+    _function = staticmethod(math.tan)
+
     def __init__(
         self, expr: Token | str, power: Optional[Token | Any] = None
     ) -> "Tangent":
@@ -1646,10 +2098,10 @@ class Tangent(_TrigFunction):
         """
         super().__init__("tan", expr, power)
 
-    def _operation(self, expr: Token, power: Token) -> Any:
-        return math.tan(expr.value) ** (1 if power is None else power.value)
-
 class ArcSine(_TrigFunction):
+    __slots__ = ()
+    _function = staticmethod(math.asin)
+
     def __init__(
         self, expr: Token | str, power: Optional[Token | Any] = None
     ) -> "ArcSine":
@@ -1663,11 +2115,11 @@ class ArcSine(_TrigFunction):
             The power to which the inverse sine is raised. Default None (equivalent to 1)
         """
         super().__init__("sin", expr, power, inverse=True)
-
-    def _operation(self, expr: Token, power: Token) -> Any:
-        return math.asin(expr.value) ** (1 if power is None else power.value)
     
 class ArcCosine(_TrigFunction):
+    __slots__ = ()
+    _function = staticmethod(math.acos)
+
     def __init__(
         self, expr: Token | str, power: Optional[Token | Any] = None
     ) -> "ArcCosine":
@@ -1681,11 +2133,11 @@ class ArcCosine(_TrigFunction):
             The power to which the inverse cosine is raised. Default None (equivalent to 1)
         """
         super().__init__("cos", expr, power, inverse=True)
-
-    def _operation(self, expr: Token, power: Token) -> Any:
-        return math.acos(expr.value) ** (1 if power is None else power.value)
     
 class ArcTangent(_TrigFunction):
+    __slots__ = ()
+    _function = staticmethod(math.atan)
+
     def __init__(
         self, expr: Token | str, power: Optional[Token | Any] = None
     ) -> "ArcTangent":
@@ -1699,11 +2151,12 @@ class ArcTangent(_TrigFunction):
             The power to which the inverse tangent is raised. Default None (equivalent to 1)
         """
         super().__init__("tan", expr, power, inverse=True)
-
-    def _operation(self, expr: Token, power: Token) -> Any:
-        return math.atan(expr.value) ** (1 if power is None else power.value)
     
 class Cosecant(_TrigFunction):
+    __slots__ = ()
+    _function = staticmethod(math.sin)
+    _reciprocal = True
+
     def __init__(
         self, expr: Token | str, power: Optional[Token | Any] = None
     ) -> "Cosecant":
@@ -1717,11 +2170,12 @@ class Cosecant(_TrigFunction):
             The power to which the cosecant is raised. Note that `power = -1` is *not* equivalent to `arccsc(a)`, but rather `1/csc(a)`. For the inverse cosecant function, use `ArcCosecant` instead. Default None (equivalent to 1)
         """
         super().__init__("csc", expr, power)
-
-    def _operation(self, expr: Token, power: Token) -> Any:
-        return 1 / math.sin(expr.value) ** (1 if power is None else power.value)
     
 class Secant(_TrigFunction):
+    __slots__ = ()
+    _function = staticmethod(math.cos)
+    _reciprocal = True
+
     def __init__(
         self, expr: Token | str, power: Optional[Token | Any] = None
     ) -> "Secant":
@@ -1735,11 +2189,12 @@ class Secant(_TrigFunction):
             The power to which the secant is raised. Note that `power = -1` is *not* equivalent to `arcsec(a)`, but rather `1/sec(a)`. For the inverse secant function, use `ArcSecant` instead. Default None (equivalent to 1)
         """
         super().__init__("sec", expr, power)
-
-    def _operation(self, expr: Token, power: Token) -> Any:
-        return 1 / math.cos(expr.value) ** (1 if power is None else power.value)
     
 class Cotangent(_TrigFunction):
+    __slots__ = ()
+    _function = staticmethod(math.tan)
+    _reciprocal = True
+
     def __init__(
         self, expr: Token | str, power: Optional[Token | Any] = None
     ) -> "Cotangent":
@@ -1753,11 +2208,11 @@ class Cotangent(_TrigFunction):
             The power to which the cotangent is raised. Note that `power = -1` is *not* equivalent to `arccot(a)`, but rather `1/cot(a)`. For the inverse cotangent function, use `ArcCotangent` instead. Default None (equivalent to 1)
         """
         super().__init__("cot", expr, power)
-
-    def _operation(self, expr: Token, power: Token) -> Any:
-        return 1 / math.tan(expr.value) ** (1 if power is None else power.value)
     
 class ArcCosecant(_TrigFunction):
+    __slots__ = ()
+    _function = staticmethod(lambda x: math.asin(1 / x))
+
     def __init__(
         self, expr: Token | str, power: Optional[Token | Any] = None
     ) -> "ArcCosecant":
@@ -1771,11 +2226,11 @@ class ArcCosecant(_TrigFunction):
             The power to which the inverse cosecant is raised. Default None (equivalent to 1)
         """
         super().__init__("csc", expr, power, inverse=True)
-
-    def _operation(self, expr: Token, power: Token) -> Any:
-        return math.asin(1 / expr.value) ** (1 if power is None else power.value)
     
 class ArcSecant(_TrigFunction):
+    __slots__ = ()
+    _function = staticmethod(lambda x: math.acos(1 / x))
+
     def __init__(
         self, expr: Token | str, power: Optional[Token | Any] = None
     ) -> "ArcSecant":
@@ -1789,11 +2244,11 @@ class ArcSecant(_TrigFunction):
             The power to which the inverse secant is raised. Default None (equivalent to 1)
         """
         super().__init__("sec", expr, power, inverse=True)
-
-    def _operation(self, expr: Token, power: Token) -> Any:
-        return math.acos(1 / expr.value) ** (1 if power is None else power.value)
     
 class ArcCotangent(_TrigFunction):
+    __slots__ = ()
+    _function = staticmethod(lambda x: math.atan(1 / x))
+
     def __init__(
         self, expr: Token | str, power: Optional[Token | Any] = None
     ) -> "ArcCotangent":
@@ -1807,11 +2262,11 @@ class ArcCotangent(_TrigFunction):
             The power to which the inverse cotangent is raised. Default None (equivalent to 1)
         """
         super().__init__("cot", expr, power, inverse=True)
-
-    def _operation(self, expr: Token, power: Token) -> Any:
-        return math.atan(1 / expr.value) ** (1 if power is None else power.value)
     
 class HyperbolicSine(_TrigFunction):
+    __slots__ = ()
+    _function = staticmethod(math.sinh)
+
     def __init__(
         self, expr: Token | str, power: Optional[Token | Any] = None
     ) -> "HyperbolicSine":
@@ -1825,11 +2280,11 @@ class HyperbolicSine(_TrigFunction):
             The power to which the hyperbolic sine is raised. Default None (equivalent to 1)
         """
         super().__init__("sinh", expr, power)
-
-    def _operation(self, expr: Token, power: Token) -> Any:
-        return math.sinh(expr.value) ** (1 if power is None else power.value)
     
 class HyperbolicCosine(_TrigFunction):
+    __slots__ = ()
+    _function = staticmethod(math.cosh)
+
     def __init__(
         self, expr: Token | str, power: Optional[Token | Any] = None
     ) -> "HyperbolicCosine":
@@ -1843,11 +2298,11 @@ class HyperbolicCosine(_TrigFunction):
             The power to which the hyperbolic cosine is raised. Default None (equivalent to 1)
         """
         super().__init__("cosh", expr, power)
-
-    def _operation(self, expr: Token, power: Token) -> Any:
-        return math.cosh(expr.value) ** (1 if power is None else power.value)
     
 class HyperbolicTangent(_TrigFunction):
+    __slots__ = ()
+    _function = staticmethod(math.tanh)
+
     def __init__(
         self, expr: Token | str, power: Optional[Token | Any] = None
     ) -> "HyperbolicTangent":
@@ -1861,11 +2316,12 @@ class HyperbolicTangent(_TrigFunction):
             The power to which the hyperbolic tangent is raised. Default None (equivalent to 1)
         """
         super().__init__("tanh", expr, power)
-
-    def _operation(self, expr: Token, power: Token) -> Any:
-        return math.tanh(expr.value) ** (1 if power is None else power.value)
     
 class HyperbolicCosecant(_TrigFunction):
+    __slots__ = ()
+    _function = staticmethod(math.sinh)
+    _reciprocal = True
+
     def __init__(
         self, expr: Token | str, power: Optional[Token | Any] = None
     ) -> "HyperbolicCosecant":
@@ -1879,11 +2335,12 @@ class HyperbolicCosecant(_TrigFunction):
             The power to which the hyperbolic cosecant is raised. Default None (equivalent to 1)
         """
         super().__init__("csch", expr, power)
-
-    def _operation(self, expr: Token, power: Token) -> Any:
-        return 1 / math.sinh(expr.value) ** (1 if power is None else power.value)
     
 class HyperbolicSecant(_TrigFunction):
+    __slots__ = ()
+    _function = staticmethod(math.cosh)
+    _reciprocal = True
+
     def __init__(
         self, expr: Token | str, power: Optional[Token | Any] = None
     ) -> "HyperbolicSecant":
@@ -1898,10 +2355,11 @@ class HyperbolicSecant(_TrigFunction):
         """
         super().__init__("sech", expr, power)
 
-    def _operation(self, expr: Token, power: Token) -> Any:
-        return 1 / math.cosh(expr.value) ** (1 if power is None else power.value)
-
 class HyperbolicCotangent(_TrigFunction):
+    __slots__ = ()
+    _function = staticmethod(math.tanh)
+    _reciprocal = True
+
     def __init__(
         self, expr: Token | str, power: Optional[Token | Any] = None
     ) -> "HyperbolicCotangent":
@@ -1916,10 +2374,10 @@ class HyperbolicCotangent(_TrigFunction):
         """        
         super().__init__("coth", expr, power)
 
-    def _operation(self, expr: Token, power: Token) -> Any:
-        return 1 / math.tanh(expr.value) ** (1 if power is None else power.value)
-
 class HyperbolicArcSine(_TrigFunction):
+    __slots__ = ()
+    _function = staticmethod(math.asinh)
+
     def __init__(
         self, expr: Token | str, power: Optional[Token | Any] = None
     ) -> "HyperbolicArcSine":
@@ -1933,11 +2391,11 @@ class HyperbolicArcSine(_TrigFunction):
             The power to which the inverse hyperbolic sine is raised. Default None (equivalent to 1)
         """
         super().__init__("sinh", expr, power, inverse=True)
-
-    def _operation(self, expr: Token, power: Token) -> Any:
-        return math.asinh(expr.value) ** (1 if power is None else power.value)
     
 class HyperbolicArcCosine(_TrigFunction):
+    __slots__ = ()
+    _function = staticmethod(math.acosh)
+
     def __init__(
         self, expr: Token | str, power: Optional[Token | Any] = None
     ) -> "HyperbolicArcCosine":
@@ -1952,10 +2410,10 @@ class HyperbolicArcCosine(_TrigFunction):
         """        
         super().__init__("cosh", expr, power, inverse=True)
 
-    def _operation(self, expr: Token, power: Token) -> Any:
-        return math.acosh(expr.value) ** (1 if power is None else power.value)
-
 class HyperbolicArcTangent(_TrigFunction):
+    __slots__ = ()
+    _function = staticmethod(math.atanh)
+
     def __init__(
         self, expr: Token | str, power: Optional[Token | Any] = None
     ) -> "HyperbolicArcTangent":
@@ -1970,10 +2428,10 @@ class HyperbolicArcTangent(_TrigFunction):
         """        
         super().__init__("tanh", expr, power, inverse=True)
 
-    def _operation(self, expr: Token, power: Token) -> Any:
-        return math.atanh(expr.value) ** (1 if power is None else power.value)
-
 class HyperbolicArcCosecant(_TrigFunction):
+    __slots__ = ()
+    _function = staticmethod(lambda x: math.asinh(1 / x))
+
     def __init__(
         self, expr: Token | str, power: Optional[Token | Any] = None
     ) -> "HyperbolicArcCosecant":
@@ -1988,10 +2446,10 @@ class HyperbolicArcCosecant(_TrigFunction):
         """        
         super().__init__("csch", expr, power, inverse=True)
 
-    def _operation(self, expr: Token, power: Token) -> Any:
-        return math.asinh(1 / expr.value) ** (1 if power is None else power.value)
-
 class HyperbolicArcSecant(_TrigFunction):
+    __slots__ = ()
+    _function = staticmethod(lambda x: math.acosh(1 / x))
+
     def __init__(
         self, expr: Token | str, power: Optional[Token | Any] = None
     ) -> "HyperbolicArcSecant":
@@ -2006,10 +2464,10 @@ class HyperbolicArcSecant(_TrigFunction):
         """        
         super().__init__("sech", expr, power, inverse=True)
 
-    def _operation(self, expr: Token, power: Token) -> Any:
-        return math.acosh(1 / expr.value) ** (1 if power is None else power.value)
-
 class HyperbolicArcCotangent(_TrigFunction):
+    __slots__ = ()
+    _function = staticmethod(lambda x: math.atanh(1 / x))
+
     def __init__(
         self, expr: Token | str, power: Optional[Token | Any] = None
     ) -> "HyperbolicArcCotangent":
@@ -2024,10 +2482,10 @@ class HyperbolicArcCotangent(_TrigFunction):
         """        
         super().__init__("coth", expr, power, inverse=True)
 
-    def _operation(self, expr: Token, power: Token) -> Any:
-        return math.atanh(1 / expr.value) ** (1 if power is None else power.value)
-
 class Logarithm(CallableToken):
+    __slots__ = ("value", "base")
+    _token_slots = ("value", "base")
+
     def __init__(
         self, value: Token | str | float, base: Token | str | float = 10
     ) -> "Logarithm":
@@ -2040,12 +2498,13 @@ class Logarithm(CallableToken):
         base : Token | str | float, optional
             The base of the logarithm. If this is 10, the base will be omitted. If it is the string `"e"`, the natural logarithm is used. Default 10
         """
-        if isinstance(base, str) and base == "e":
-            return NaturalLogarithm(value)
         self.value = as_token(value)
         self.base = as_token(base)
 
+    @render_str
     def __str__(self) -> str:
+        if self.base.value == "e":
+            return f"\\ln{{{self.value}}}"
         if self.base.value == 10:
             return f"\\log{{{self.value}}}"
         return f"\\log_{{{self.base}}}{{{self.value}}}"
@@ -2056,15 +2515,20 @@ class Logarithm(CallableToken):
         return Quantity(math.log(self.value.value, self.base.value))(*args, **kwargs)
     
 class NaturalLogarithm(Logarithm):
+    __slots__ = ()
+
     def __init__(
         self, value: Token | str | float
     ) -> "NaturalLogarithm":
         super().__init__(value, "e")
 
+    @render_str
     def __str__(self) -> str:
         return f"\\ln{{{self.value}}}"
     
 class Exponential:
+    __slots__ = ("value", "use_exp")
+
     def __init__(
         self, value: Token | str | float,
         use_exp: Optional[bool] = None 
@@ -2084,13 +2548,16 @@ class Exponential:
     def __str__(self) -> str:
         use_exp = self.use_exp if self.use_exp is not None else USE_EXP_FOR_EXPONENTIAL
         if use_exp:
-            return _Container(Macro("exp"), Bracket(self.value, scale=True))
-        return Power(Macro("mathrm", "e"), self.value)
+            return f"{_exp}\\left( {self.value} \\right)"
+        return str(Power(_euler, self.value))
 
     def __call__(self, *args: Any, **kwargs: Any) -> Literal:
         return Quantity(math.exp(self.value.value))(*args, **kwargs)
     
 class Function(Token):
+    __slots__ = ("name", "args")
+    _token_slots = ("name", "args")
+
     def __init__(self, name: Token | str, *args: Token | str | Any) -> "Function":
         """A function expression, such as `f(a, b)`.
         
@@ -2102,8 +2569,9 @@ class Function(Token):
             The arguments to the function.
         """
         self.name = as_token(name)
-        self.args = [as_token(arg) for arg in args]
+        self.args = list(map(as_token, args))
     
+    @render_str
     def __str__(self) -> str :
         if len(self.args) == 1:
             return str(self.name * (self.args[0], ))
@@ -2118,48 +2586,48 @@ class Function(Token):
 # Greek Letters
 
 
-alpha = Macro("alpha")
-beta = Macro("beta")
-gamma = Macro("gamma")
-delta = Macro("delta")
-epsilon = Macro("epsilon")
-varepsilon = Macro("varepsilon")
-zeta = Macro("zeta")
-eta = Macro("eta")
-theta = Macro("theta")
-vartheta = Macro("vartheta")
-iota = Macro("iota")
-kappa = Macro("kappa")
-lambda_ = Macro("lambda")
-mu = Macro("mu")
-nu = Macro("nu")
-xi = Macro("xi")
+alpha = _ConstantMacro("alpha")
+beta = _ConstantMacro("beta")
+gamma = _ConstantMacro("gamma")
+delta = _ConstantMacro("delta")
+epsilon = _ConstantMacro("epsilon")
+varepsilon = _ConstantMacro("varepsilon")
+zeta = _ConstantMacro("zeta")
+eta = _ConstantMacro("eta")
+theta = _ConstantMacro("theta")
+vartheta = _ConstantMacro("vartheta")
+iota = _ConstantMacro("iota")
+kappa = _ConstantMacro("kappa")
+lambda_ = _ConstantMacro("lambda")
+mu = _ConstantMacro("mu")
+nu = _ConstantMacro("nu")
+xi = _ConstantMacro("xi")
 pi = Variable("\\pi", 3.1415926535897932384626433832795028841971693993751058209749445)
-varpi = Macro("varpi")
-rho = Macro("rho")
-varrho = Macro("varrho")
-sigma = Macro("sigma")
-varsigma = Macro("varsigma")
-tau = Macro("tau")
-upsilon = Macro("upsilon")
-phi = Macro("phi")
-varphi = Macro("varphi")
-chi = Macro("chi")
-psi = Macro("psi")
-omega = Macro("omega")
-Gamma = Macro("Gamma")
-Delta = Macro("Delta")
-Theta = Macro("Theta")
-Lambda = Macro("Lambda")
-Xi = Macro("Xi")
-Pi = Macro("Pi")
-Sigma = Macro("Sigma")
-Upsilon = Macro("Upsilon")
-Phi = Macro("Phi")
-Psi = Macro("Psi")
-Omega = Macro("Omega")
-
-nabla = Macro("nabla")
+varpi = _ConstantMacro("varpi")
+rho = _ConstantMacro("rho")
+varrho = _ConstantMacro("varrho")
+sigma = _ConstantMacro("sigma")
+varsigma = _ConstantMacro("varsigma")
+tau = _ConstantMacro("tau")
+upsilon = _ConstantMacro("upsilon")
+phi = _ConstantMacro("phi")
+varphi = _ConstantMacro("varphi")
+chi = _ConstantMacro("chi")
+psi = _ConstantMacro("psi")
+omega = _ConstantMacro("omega")
+Gamma = _ConstantMacro("Gamma")
+Delta = _ConstantMacro("Delta")
+Theta = _ConstantMacro("Theta")
+Lambda = _ConstantMacro("Lambda")
+Xi = _ConstantMacro("Xi")
+Pi = _ConstantMacro("Pi")
+Sigma = _ConstantMacro("Sigma")
+Upsilon = _ConstantMacro("Upsilon")
+Phi = _ConstantMacro("Phi")
+Psi = _ConstantMacro("Psi")
+Omega = _ConstantMacro("Omega")
+
+nabla = _ConstantMacro("nabla")
 
 i = Literal("i")
 
@@ -2415,421 +2883,41 @@ def widetilde(expr: Token | str | float) -> Macro:
     """
     return Macro("widetilde", expr)
 
-def sin(expr: Token | str | float, power: Optional[Token | str | float] = None) -> Sine:
-    """The sine of an expression, optionally to some power, such as `\\sin^2(a)`. The value is calculated using the `math` library.
-
-    Parameters
-    ----------
-    expr : Token | str
-        The operand to the sine function.
-    power : Optional[Token  |  Any], optional
-        The power to which the sine is raised. Note that `power = -1` is *not* equivalent to `arcsin(a)`, but rather `1/sin(a)`. For the inverse sine function, use `ArcSine` instead. Default None (equivalent to 1)
-
-    Returns
-    -------
-    Sine
-        The sine of the expression.
-    """        
-    return Sine(expr, power)
-
-def cos(expr: Token | str | float, power: Optional[Token | str | float] = None) -> Cosine:
-    """The cosine of an expression, optionally to some power, such as `\\cos^2(a)`. The value is calculated using the `math` library.
-
-    Parameters
-    ----------
-    expr : Token | str
-        The operand to the cosine function.
-    power : Optional[Token  |  Any], optional
-        The power to which the cosine is raised. Note that `power = -1` is *not* equivalent to `arccos(a)`, but rather `1/cos(a)`. For the inverse cosine function, use `ArcCosine` instead. Default None (equivalent to 1)
-
-    Returns
-    -------
-    Cosine
-        The cosine of the expression.
-    """        
-    return Cosine(expr, power)
-
-def tan(expr: Token | str | float, power: Optional[Token | str | float] = None) -> Tangent:
-    """The tangent of an expression, optionally to some power, such as `\\tan^2(a)`. The value is calculated using the `math` library.
-
-    Parameters
-    ----------
-    expr : Token | str
-        The operand to the tangent function.
-    power : Optional[Token  |  Any], optional
-        The power to which the tangent is raised. Note that `power = -1` is *not* equivalent to `arctan(a)`, but rather `1/tan(a)`. For the inverse tangent function, use `ArcTangent` instead. Default None (equivalent to 1)
-
-    Returns
-    -------
-    Tangent
-        The tangent of the expression.
-    """
-    return Tangent(expr, power)
-
-def arcsin(expr: Token | str | float, power: Optional[Token | str | float] = None) -> ArcSine:
-    """The inverse sine of an expression, optionally to some power, such as `\\sin^{-1}(a)`. The value is calculated using the `math` library.
-
-    Parameters
-    ----------
-    expr : Token | str
-        The operand to the inverse sine function.
-    power : Optional[Token  |  Any], optional
-        The power to which the inverse sine is raised. Default None (equivalent to 1)
-
-    Returns
-    -------
-    ArcSine
-        The inverse sine of the expression.
-    """
-    return ArcSine(expr, power)
-
-def arccos(expr: Token | str | float, power: Optional[Token | str | float] = None) -> ArcCosine:
-    """The inverse cosine of an expression, optionally to some power, such as `\\cos^{-1}(a)`. The value is calculated using the `math` library.
-
-    Parameters
-    ----------
-    expr : Token | str
-        The operand to the inverse cosine function.
-    power : Optional[Token  |  Any], optional
-        The power to which the inverse cosine is raised. Default None (equivalent to 1)
-
-    Returns
-    -------
-    ArcCosine
-        The inverse cosine of the expression.
-    """
-    return ArcCosine(expr, power)
-
-def arctan(expr: Token | str | float, power: Optional[Token | str | float] = None) -> ArcTangent:
-    """The inverse tangent of an expression, optionally to some power, such as `\\tan^{-1}(a)`. The value is calculated using the `math` library.
-
-    Parameters
-    ----------
-    expr : Token | str
-        The operand to the inverse tangent function.
-    power : Optional[Token  |  Any], optional
-        The power to which the inverse tangent is raised. Default None (equivalent to 1)
+# The trigonometric functions are the classes themselves, which take the same arguments
+sin = Sine
+cos = Cosine
+tan = Tangent
+arcsin = ArcSine
+arccos = ArcCosine
+arctan = ArcTangent
 
-    Returns
-    -------
-    ArcTangent
-        The inverse tangent of the expression.
-    """
-    return ArcTangent(expr, power)
-
-asin = arcsin   
+asin = arcsin
 acos = arccos
 atan = arctan
 
-def csc(expr: Token | str | float, power: Optional[Token | str | float] = None) -> Cosecant:
-    """The cosecant of an expression, optionally to some power, such as `\\csc^2(a)`. The value is calculated using the `math` library.
-
-    Parameters
-    ----------
-    expr : Token | str
-        The operand to the cosecant function.
-    power : Optional[Token  |  Any], optional
-        The power to which the cosecant is raised. Note that `power = -1` is *not* equivalent to `arccsc(a)`, but rather `1/csc(a)`. For the inverse cosecant function, use `ArcCosecant` instead. Default None (equivalent to 1)
-
-    Returns
-    -------
-    Cosecant
-        The cosecant of the expression.
-    """
-    return Cosecant(expr, power)
-
-def sec(expr: Token | str | float, power: Optional[Token | str | float] = None) -> Secant:
-    """The secant of an expression, optionally to some power, such as `\\sec^2(a)`. The value is calculated using the `math` library.
-
-    Parameters
-    ----------
-    expr : Token | str
-        The operand to the secant function.
-    power : Optional[Token  |  Any], optional
-        The power to which the secant is raised. Note that `power = -1` is *not* equivalent to `arcsec(a)`, but rather `1/sec(a)`. For the inverse secant function, use `ArcSecant` instead. Default None (equivalent to 1)
-
-    Returns
-    -------
-    Secant
-        The secant of the expression.
-    """
-    return Secant(expr, power)
-
-def cot(expr: Token | str | float, power: Optional[Token | str | float] = None) -> Cotangent:
-    """The cotangent of an expression, optionally to some power, such as `\\cot^2(a)`. The value is calculated using the `math` library.
-
-    Parameters
-    ----------
-    expr : Token | str
-        The operand to the cotangent function.
-    power : Optional[Token  |  Any], optional
-        The power to which the cotangent is raised. Note that `power = -1` is *not* equivalent to `arccot(a)`, but rather `1/cot(a)`. For the inverse cotangent function, use `ArcCotangent` instead. Default None (equivalent to 1)
-
-    Returns
-    -------
-    Cotangent
-        The cotangent of the expression.
-    """
-    return Cotangent(expr, power)
-
-def arccsc(expr: Token | str | float, power: Optional[Token | str | float] = None) -> ArcCosecant:
-    """The inverse cosecant of an expression, optionally to some power, such as `\\csc^{-1}(a)`. The value is calculated using the `math` library.
-
-    Parameters
-    ----------
-    expr : Token | str
-        The operand to the inverse cosecant function.
-    power : Optional[Token  |  Any], optional
-        The power to which the inverse cosecant is raised. Default None (equivalent to 1)
-
-    Returns
-    -------
-    ArcCosecant
-        The inverse cosecant of the expression.
-    """
-    return ArcCosecant(expr, power)
-
-def arcsec(expr: Token | str | float, power: Optional[Token | str | float] = None) -> ArcSecant:
-    """The inverse secant of an expression, optionally to some power, such as `\\sec^{-1}(a)`. The value is calculated using the `math` library.
-
-    Parameters
-    ----------
-    expr : Token | str
-        The operand to the inverse secant function.
-    power : Optional[Token  |  Any], optional
-        The power to which the inverse secant is raised. Default None (equivalent to 1)
-
-    Returns
-    -------
-    ArcSecant
-        The inverse secant of the expression.
-    """
-    return ArcSecant(expr, power)
-
-def arccot(expr: Token | str | float, power: Optional[Token | str | float] = None) -> ArcCotangent:
-    """The inverse cotangent of an expression, optionally to some power, such as `\\cot^{-1}(a)`. The value is calculated using the `math` library.
-
-    Parameters
-    ----------
-    expr : Token | str
-        The operand to the inverse cotangent function.
-    power : Optional[Token  |  Any], optional
-        The power to which the inverse cotangent is raised. Default None (equivalent to 1)
-
-    Returns
-    -------
-    ArcCotangent
-        The inverse cotangent of the expression.
-    """
-    return ArcCotangent(expr, power)
+csc = Cosecant
+sec = Secant
+cot = Cotangent
+arccsc = ArcCosecant
+arcsec = ArcSecant
+arccot = ArcCotangent
 
 acsc = arccsc
 asec = arcsec
 acot = arccot
 
-def sinh(expr: Token | str | float, power: Optional[Token | str | float] = None) -> HyperbolicSine:
-    """The hyperbolic sine of an expression, optionally to some power, such as `\\sinh^2(a)`. The value is calculated using the `math` library.
-
-    Parameters
-    ----------
-    expr : Token | str
-        The operand to the hyperbolic sine function.
-    power : Optional[Token  |  Any], optional
-        The power to which the hyperbolic sine is raised. Default None (equivalent to 1)
-
-    Returns
-    -------
-    HyperbolicSine
-        The hyperbolic sine of the expression.
-    """
-    return HyperbolicSine(expr, power)
-
-def cosh(expr: Token | str | float, power: Optional[Token | str | float] = None) -> HyperbolicCosine:
-    """The hyperbolic cosine of an expression, optionally to some power, such as `\\cosh^2(a)`. The value is calculated using the `math` library.
-
-    Parameters
-    ----------
-    expr : Token | str
-        The operand to the hyperbolic cosine function.
-    power : Optional[Token  |  Any], optional
-        The power to which the hyperbolic cosine is raised. Default None (equivalent to 1)
-
-    Returns
-    -------
-    HyperbolicCosine
-        The hyperbolic cosine of the expression.
-    """
-    return HyperbolicCosine(expr, power)
-
-def tanh(expr: Token | str | float, power: Optional[Token | str | float] = None) -> HyperbolicTangent:
-    """The hyperbolic tangent of an expression, optionally to some power, such as `\\tanh^2(a)`. The value is calculated using the `math` library.
-
-    Parameters
-    ----------
-    expr : Token | str
-        The operand to the hyperbolic tangent function.
-    power : Optional[Token  |  Any], optional
-        The power to which the hyperbolic tangent is raised. Default None (equivalent to 1)
-
-    Returns
-    -------
-    HyperbolicTangent
-        The hyperbolic tangent of the expression.
-    """
-    return HyperbolicTangent(expr, power)
-
-def csch(expr: Token | str | float, power: Optional[Token | str | float] = None) -> HyperbolicCosecant:
-    """The hyperbolic cosecant of an expression, optionally to some power, such as `\\csch^2(a)`. The value is calculated using the `math` library.
-
-    Parameters
-    ----------
-    expr : Token | str
-        The operand to the hyperbolic cosecant function.
-    power : Optional[Token  |  Any], optional
-        The power to which the hyperbolic cosecant is raised. Default None (equivalent to 1)
-
-    Returns
-    -------
-    HyperbolicCosecant
-        The hyperbolic cosecant of the expression.
-    """
-    return HyperbolicCosecant(expr, power)
-
-def sech(expr: Token | str | float, power: Optional[Token | str | float] = None) -> HyperbolicSecant:
-    """The hyperbolic secant of an expression, optionally to some power, such as `\\sech^2(a)`. The value is calculated using the `math` library.
-
-    Parameters
-    ----------
-    expr : Token | str
-        The operand to the hyperbolic secant function.
-    power : Optional[Token  |  Any], optional
-        The power to which the hyperbolic secant is raised. Default None (equivalent to 1)
-
-    Returns
-    -------
-    HyperbolicSecant
-        The hyperbolic secant of the expression.
-    """
-    return HyperbolicSecant(expr, power)
-
-def coth(expr: Token | str | float, power: Optional[Token | str | float] = None) -> HyperbolicCotangent:
-    """The hyperbolic cotangent of an expression, optionally to some power, such as `\\coth^2(a)`. The value is calculated using the `math` library.
-
-    Parameters
-    ----------
-    expr : Token | str
-        The operand to the hyperbolic cotangent function.
-    power : Optional[Token  |  Any], optional
-        The power to which the hyperbolic cotangent is raised. Default None (equivalent to 1)
-
-    Returns
-    -------
-    HyperbolicCotangent
-        The hyperbolic cotangent of the expression.
-    """
-    return HyperbolicCotangent(expr, power)
-
-def arcsinh(expr: Token | str | float, power: Optional[Token | str | float] = None) -> HyperbolicArcSine:
-    """The inverse hyperbolic sine of an expression, optionally to some power, such as `\\sinh^{-1}(a)`. The value is calculated using the `math` library.
-
-    Parameters
-    ----------
-    expr : Token | str
-        The operand to the inverse hyperbolic sine function.
-    power : Optional[Token  |  Any], optional
-        The power to which the inverse hyperbolic sine is raised. Default None (equivalent to 1)
-
-    Returns
-    -------
-    HyperbolicArcSine
-        The inverse hyperbolic sine of the expression.
-    """
-    return HyperbolicArcSine(expr, power)
-
-def arccosh(expr: Token | str | float, power: Optional[Token | str | float] = None) -> HyperbolicArcCosine:
-    """The inverse hyperbolic cosine of an expression, optionally to some power, such as `\\cosh^{-1}(a)`. The value is calculated using the `math` library.
-
-    Parameters
-    ----------
-    expr : Token | str
-        The operand to the inverse hyperbolic cosine function.
-    power : Optional[Token  |  Any], optional
-        The power to which the inverse hyperbolic cosine is raised. Default None (equivalent to 1)
-
-    Returns
-    -------
-    HyperbolicArcCosine
-        The inverse hyperbolic cosine of the expression.
-    """
-    return HyperbolicArcCosine(expr, power)
-
-def arctanh(expr: Token | str | float, power: Optional[Token | str | float] = None) -> HyperbolicArcTangent:
-    """The inverse hyperbolic tangent of an expression, optionally to some power, such as `\\tanh^{-1}(a)`. The value is calculated using the `math` library.
-
-    Parameters
-    ----------
-    expr : Token | str
-        The operand to the inverse hyperbolic tangent function.
-    power : Optional[Token  |  Any], optional
-        The power to which the inverse hyperbolic tangent is raised. Default None (equivalent to 1)
-
-    Returns
-    -------
-    HyperbolicArcTangent
-        The inverse hyperbolic tangent of the expression.
-    """
-    return HyperbolicArcTangent(expr, power)
-
-def arccsch(expr: Token | str | float, power: Optional[Token | str | float] = None) -> HyperbolicArcCosecant:
-    """The inverse hyperbolic cosecant of an expression, optionally to some power, such as `\\csch^{-1}(a)`. The value is calculated using the `math` library.
-
-    Parameters
-    ----------
-    expr : Token | str
-        The operand to the inverse hyperbolic cosecant function.
-    power : Optional[Token  |  Any], optional
-        The power to which the inverse hyperbolic cosecant is raised. Default None (equivalent to 1)
-
-    Returns
-    -------
-    HyperbolicArcCosecant
-        The inverse hyperbolic cosecant of the expression.
-    """
-    return HyperbolicArcCosecant(expr, power)
-
-def arcsech(expr: Token | str | float, power: Optional[Token | str | float] = None) -> HyperbolicArcSecant:
-    """The inverse hyperbolic secant of an expression, optionally to some power, such as `\\sech^{-1}(a)`. The value is calculated using the `math` library.
-
-    Parameters
-    ----------
-    expr : Token | str
-        The operand to the inverse hyperbolic secant function.
-    power : Optional[Token  |  Any], optional
-        The power to which the inverse hyperbolic secant is raised. Default None (equivalent to 1)
-
-    Returns
-    -------
-    HyperbolicArcSecant
-        The inverse hyperbolic secant of the expression.
-    """
-    return HyperbolicArcSecant(expr, power)
-
-def arccoth(expr: Token | str | float, power: Optional[Token | str | float] = None) -> HyperbolicArcCotangent:
-    """The inverse hyperbolic cotangent of an expression, optionally to some power, such as `\\coth^{-1}(a)`. The value is calculated using the `math` library.
-
-    Parameters
-    ----------
-    expr : Token | str
-        The operand to the inverse hyperbolic cotangent function.
-    power : Optional[Token  |  Any], optional
-        The power to which the inverse hyperbolic cotangent is raised. Default None (equivalent to 1)
-
-    Returns
-    -------
-    HyperbolicArcCotangent
-        The inverse hyperbolic cotangent of the expression.
-    """
-    return HyperbolicArcCotangent(expr, power)
+sinh = HyperbolicSine
+cosh = HyperbolicCosine
+tanh = HyperbolicTangent
+csch = HyperbolicCosecant
+sech = HyperbolicSecant
+coth = HyperbolicCotangent
+arcsinh = HyperbolicArcSine
+arccosh = HyperbolicArcCosine
+arctanh = HyperbolicArcTangent
+arccsch = HyperbolicArcCosecant
+arcsech = HyperbolicArcSecant
+arccoth = HyperbolicArcCotangent
 
 asinh = arcsinh
 acosh = arccosh
@@ -2978,7 +3066,7 @@ empty = Literal("")
 alignment = Literal("&")
 
 zero, one, two, three, four, five, six, seven, eight, nine = map(Literal, range(10))
-inf = Macro("infty")
+inf = _ConstantMacro("infty")
 infinity = inf
 infty = inf
 
@@ -3063,21 +3151,18 @@ symbols = define_symbols
 def split(lines: List[str | Token | Tuple[str | Token]], environment="split", separator: str | None = "=") -> str:
     if not isinstance(lines, (list, tuple)):
         lines = [lines]
-    for i, line in enumerate(lines):
+    rows = []
+    for line in lines:
         if isinstance(line, (list, tuple)):
             if len(line) == 1:
-                lines[i] = f"& {separator if separator is not None else '='} {line[0]}"
+                rows.append(f"& {separator if separator is not None else '='} {line[0]}")
+            elif separator is None:
+                rows.append(" & ".join(map(str, line)))
+            elif len(line) == 2:
+                rows.append(f"{line[0]} & {separator} {line[1]}")
             else:
-                if separator is None:
-                    lines[i] = " & ".join(str(expr) for expr in line)
-                if len(line) == 2:
-                    lines[i] = f"{line[0]} & {separator} {line[1]}"
-                else:
-                    lines[i] = f"{line[0]} & {separator} {line[1]} & " + " & ".join(str(expr) for expr in line[2:])
+                rows.append(f"{line[0]} & {separator} {line[1]} & " + " & ".join(map(str, line[2:])))
         else:
-            lines[i] = str(line)
-    return (
-        f"\\begin{{{environment}}}\n\t"
-        + "\\\\\n\t".join(lines)
-        + f"\n\\end{{{environment}}}"
-    )
\ No newline at end of file
+            rows.append(str(line))
+    body = "\\\\\n\t".join(rows)
+    return f"\\begin{{{environment}}}\n\t{body}\n\\end{{{environment}}}"
@@ -612,6 +612,8 @@ def read_pyndoc_conditional_md_file(contents: str, start: int, target_format: st
             return skip, file_contents
     return skip, ""
 
+macro_pattern = re.compile(r"[ib]?\%{1,2}\w")
+
 CHUNK_SIZES = [10_000, 5000, 2000, 1000, 500, 250, 100]
 
 def contains_any(string: str, tests: List[str]) -> bool:
@@ -640,11 +642,10 @@ def preprocess(contents: str, target_format: str | None = None) -> str:
             continue
         next_char = contents[i + 1] if i + 1 < len_contents else None
         c = contents[i]
-        if contents[i:].startswith("<!--"):
+        if contents.startswith("<!--", i):
             # this is the start of a comment. Skip until the end of the comment
-            while not contents[i:].startswith("-->") and i < len_contents:
-                i += 1
-            i += 3
+            end = contents.find("-->", i)
+            i = (len_contents if end == -1 else end) + 3
             continue
         if c == "\\":
             # escape character
@@ -666,31 +667,31 @@ def preprocess(contents: str, target_format: str | None = None) -> str:
             new_text.write(math)
             i += skip
             continue
-        if re.match(r"[ib]?\%{1,2}\w", contents[i:]):
+        if macro_pattern.match(contents, i):
             # a pyndoc macro
             skip, replacement = read_pyndoc_macro(contents, i)
             new_text.write(replacement)
             i += skip
             continue
-        if contents[i:].startswith("%{"):
+        if contents.startswith("%{", i):
             # a pyndoc block
             skip, replacement = read_pyndoc_block(contents, i)
             new_text.write(replacement)
             i += skip
             continue
-        if contents[i:].startswith("%%%py{"):
+        if contents.startswith("%%%py{", i):
             # a pyndoc file inclusion
             skip, replacement = read_pyndoc_file(contents, i, target_format)
             new_text.write(replacement)
             i += skip
             continue
-        if contents[i:].startswith("%%%mdifformat"):
+        if contents.startswith("%%%mdifformat", i):
             # evaluated during preprocessing
             skip, block = read_pyndoc_conditional_md_file(contents, i, target_format)
             new_text.write(block)
             i += skip
             continue
-        if contents[i:].startswith("%%%md"):
+        if contents.startswith("%%%md", i):
             # a pyndoc markdown file inclusion
             skip, replacement = read_pyndoc_md_file(contents, i, target_format)
             new_text.write(replacement)
@@ -698,6 +699,6 @@ def preprocess(contents: str, target_format: str | None = None) -> str:
             continue
         new_text.write(c)
         i += 1
-    new_text = new_text.getvalue()
-    new_text = re.sub(r"\n\n+", "\n\n", new_text)
-    return new_text
+    text = new_text.getvalue()
+    new_text.close()  # release the buffer before the final copy is made
+    return re.sub(r"\n\n+", "\n\n", text)
@@ -198,14 +198,14 @@ def object_handler(connection: socket.socket, message: Dict) -> bool:
         return True
     if isinstance(output, panflute.Element):
         output = output.to_json()
-        logging.debug("Received object request:\n" + message['message'])
-        logging.debug(f"Output here: \n{json.dumps(output, indent = 2)}")
     elif isinstance(output, list) and len(output) == 1 and isinstance(output[0], panflute.Element):
         output = output[0].to_json()
-        logging.debug("Received object request:\n" + message['message'])
-        logging.debug(f"Output here: \n{json.dumps(output, indent = 2)}")
     else:
         raise ValueError(f"Unsupported object type: {type(output)}")
+    logging.debug("Received object request:\n%s", message['message'])
+    if logging.getLogger().isEnabledFor(logging.DEBUG):
+        # serialising the whole tree is expensive, so only do it if it will be written
+        logging.debug("Output here: \n%s", json.dumps(output, indent = 2))
     send_response(connection, output, 'object')
     return True
 
@@ -0,0 +1,276 @@
+import math
+import threading
+
+import pytest
+
+import pyndoc.latex as tex
+from pyndoc.latex import (
+    AbsoluteValue,
+    Bracket,
+    Concatenation,
+    Exponential,
+    Literal,
+    Logarithm,
+    Macro,
+    Quantity,
+    Sine,
+    SquareBracket,
+    Summation,
+    Variable,
+    as_token,
+    format_value,
+    format_values,
+    ureg,
+)
+
+
+# Rendering changed tokens
+
+
+def test_reassigning_limits_rerenders():
+    s = Summation("x", "i=0", "n")
+    assert "^{N}" not in str(s)
+    s.upper = as_token("N")
+    assert "^{N}" in str(s)
+
+
+def test_changing_children_in_place_rerenders():
+    x, y, z = Literal("x"), Literal("y"), Literal("z")
+    b = Bracket(x, y)
+    assert str(b) == "( x, y )"
+    b.children.append(z)
+    assert str(b) == "( x, y, z )"
+    del b.children[0]
+    assert str(b) == "( y, z )"
+
+
+def test_renaming_variable_rerenders_containing_tokens():
+    v = Variable("v", 2)
+    expr = v + 1
+    assert str(expr) == "v + 1"
+    v.name = Literal("y")
+    assert str(expr) == "y + 1"
+    assert str(v + 1) == "y + 1"
+
+
+def test_changing_literal_rerenders_containing_tokens():
+    c = Literal("c")
+    expr = c * 2
+    assert str(expr) == "c 2"
+    c.value = "q"
+    assert str(expr) == "q 2"
+
+
+def test_changing_quantity_rerenders_containing_tokens():
+    q = Quantity(3.0)
+    expr = q + Literal("x")
+    assert str(expr) == "3 + x"
+    q.value = 7.0
+    assert str(expr) == "7 + x"
+
+
+def test_changing_format_option_rerenders(monkeypatch):
+    q = Quantity(1.23456)
+    assert str(q) == "1.235"
+    monkeypatch.setattr(tex, "DEFAULT_FORMAT", ".2f")
+    assert str(q) == "1.23"
+
+
+# Canonicalization
+
+
+def test_canonicalize_shares_repeated_operations():
+    x, one = Variable("x", 2), Quantity(1)
+    expr = ((x + one) * (x + one)).canonicalize()
+    assert expr.left is expr.right
+    assert expr.value == 9
+    x.value = 3
+    assert expr.value == 16
+
+
+def test_canonicalize_keeps_different_operations():
+    x, one = Variable("x", 2), Quantity(1)
+    expr = ((x + one) * (x - one)).canonicalize()
+    assert expr.left is not expr.right
+    assert expr.value == 3
+
+
+def test_canonicalize_shares_operations_in_tuples():
+    x, one = Variable("x", 2), Quantity(1)
+    concatenation = Concatenation(x + one, x + one).canonicalize()
+    assert concatenation.args[0] is concatenation.args[1]
+    macro = Macro("frac", x + one, (x + one, True)).canonicalize()
+    assert macro.arguments[0] is macro.arguments[1][0]
+
+
+def test_canonicalize_keeps_operations_in_different_units():
+    length = Quantity(1, unit="m")
+    metres, centimetres = length + length, length + length
+    centimetres.unit = "cm"
+    expr = Concatenation(metres, centimetres).canonicalize()
+    assert expr.args[0] is not expr.args[1]
+    assert str(expr.args[0]()) == "2\\ \\mathrm{m}"
+    assert str(expr.args[1]()) == "200\\ \\mathrm{cm}"
+
+
+# Chained operations
+
+
+def test_chained_addition_is_summed_in_one_loop(monkeypatch):
+    chains = []
+    chain_operands = tex._chain_operands
+
+    def record(token):
+        operands = chain_operands(token)
+        chains.append(len(operands))
+        return operands
+
+    monkeypatch.setattr(tex, "_chain_operands", record)
+    x = Variable("x", 2)
+    expr = x
+    for _ in range(9):
+        expr = expr + x
+    assert expr.value == 20
+    assert chains == [10]
+
+
+# Converting values to tokens
+
+
+def test_as_token_converts_numbers():
+    assert isinstance(as_token(1.5), Quantity)
+    assert str(as_token(4)) == "4"
+
+
+def test_as_token_brackets_sequences():
+    assert isinstance(as_token((1, 2)), Bracket)
+    assert isinstance(as_token([1]), SquareBracket)
+
+
+def test_as_token_rejects_other_types():
+    with pytest.raises(TypeError):
+        as_token(object())
+
+
+def test_as_token_reads_numbers_from_strings():
+    assert isinstance(as_token("1.5"), Quantity)
+    assert as_token("-2e3").value == -2000
+    # Not numbers, as they are more likely to be symbols
+    assert isinstance(as_token("inf"), Literal)
+
+
+def test_as_token_does_not_share_literals():
+    a = as_token("a")
+    assert isinstance(a, Literal)
+    a.value = "z"
+    assert str(as_token("a")) == "a"
+
+
+# Deep expressions
+
+
+def _long_sum(x, terms):
+    expr = x
+    for _ in range(terms):
+        expr = expr + 1
+    return expr
+
+
+def test_rendering_deep_expression():
+    expr = _long_sum(Literal("x"), 5000)
+    assert str(expr) == "x" + " + 1" * 5000
+
+
+def test_evaluating_deep_expression():
+    x = Variable("x", 2)
+    expr = _long_sum(x, 5000)
+    assert expr.value == 5002
+    x.value = 3
+    assert expr.value == 5003
+
+
+def test_rendering_deep_expressions_in_threads():
+    exprs = [_long_sum(Literal(name), 5000) for name in "abcd"]
+    results = {}
+
+    def render(expr):
+        results[id(expr)] = str(expr)
+
+    threads = [threading.Thread(target=render, args=(expr,)) for expr in exprs]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    for name, expr in zip("abcd", exprs):
+        assert results[id(expr)] == name + " + 1" * 5000
+
+
+# Memoised values
+
+
+def test_trig_value_follows_changed_argument():
+    x = Variable("x", 0.0)
+    s = Sine(x)
+    assert s.value == 0.0
+    x.value = 2.0
+    assert s.value == math.sin(2.0)
+    assert s.value == math.sin(2.0)
+
+
+def test_logarithm_follows_changed_argument():
+    x = Variable("x", 100)
+    log = Logarithm(x)
+    assert log(fmt=".3g") == "2"
+    x.value = 1000
+    assert log(fmt=".3g") == "3"
+    log.base = as_token(2)
+    assert log(fmt=".3g") == "9.97"
+
+
+def test_exponential_follows_changed_argument():
+    x = Variable("x", 0)
+    e = Exponential(x)
+    assert e(fmt=".3g") == "1"
+    x.value = 1
+    assert e(fmt=".3g") == "2.72"
+    e.value = as_token(2)
+    assert e(fmt=".3g") == "7.39"
+
+
+def test_absolute_value_follows_changed_contents():
+    x = Variable("x", -2)
+    a = AbsoluteValue(x)
+    assert a.value == 2
+    x.value = -5
+    assert a.value == 5
+
+
+# Formatting
+
+
+def test_truncating_grouped_values():
+    assert format_value(1234.56789123, ",")[0] == "1,234.567891"
+    assert format_value(1234.56789123, "_")[0] == "1_234.567891"
+    # Rounding can carry into (and regroup) the integer part
+    assert format_value(-999999.99999999, ",")[0] == "-1,000,000"
+
+
+def test_formatting_several_values():
+    values = [1.5, ureg.Quantity(2, "m"), 3]
+    assert format_values(values, ".3g") == ["1.5", "2\\ \\mathrm{m}", "3"]
+    assert format_values(values, ".3g", "cm") == ["1.5\\ \\mathrm{cm}", "200\\ \\mathrm{cm}", "3\\ \\mathrm{cm}"]
+
+
+def test_formatting_an_array_of_values():
+    numpy = pytest.importorskip("numpy")
+    values = ureg.Quantity(numpy.array([1.0, 2.5]), "m")
+    assert format_values(values, ".3g", "cm") == ["100\\ \\mathrm{cm}", "250\\ \\mathrm{cm}"]
+    with pytest.raises(ValueError):
+        format_values(values, ".3g", "s")
+
+
+def test_formatting_a_single_value_as_several():
+    with pytest.raises(TypeError):
+        format_values(ureg.Quantity(2, "m"))
+    with pytest.raises(TypeError):
+        format_values(2.0)